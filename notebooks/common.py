@@ -0,0 +1,42 @@
+"""
+Shared Helpers
+Small utilities used by the course modules and the automation tools
+"""
+
+import sys
+import json
+from pathlib import Path
+
+try:
+    import orjson  # Optional, faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+# dataclass() kwargs for slotted classes (no per-instance __dict__) on 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Directories already created this run, so repeated saves skip the mkdir
+_dir_exists_cache = set()
+
+
+def ensure_dir(path: Path):
+    """Create path (and parents) once per run"""
+    if path not in _dir_exists_cache:
+        path.mkdir(parents=True, exist_ok=True)
+        _dir_exists_cache.add(path)
+
+
+def read_json(path: Path):
+    """Parse a JSON file"""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_json(path: Path, obj, indent: bool = True):
+    """Serialize obj in memory and write it with a single call (compact if not indent)"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None))
+    else:
+        path.write_text(json.dumps(obj, indent=2 if indent else None))
@@ -4,12 +4,38 @@ Supports OpenAI, Anthropic (Claude), and Ollama
 """
 
 import os
-from typing import Optional, Dict, List, Any
+import re
+import sys
+import json
+import time
+import asyncio
+import random
+import hashlib
+import threading
+import warnings
+import importlib.util
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Optional, Dict, List, Any, AsyncIterator
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
+try:
+    from orjson import loads as _json_loads  # Optional, faster NDJSON parsing
+except ImportError:
+    _json_loads = json.loads
 
-@dataclass
+# Import shared helpers through the notebooks package, even when this
+# module is loaded with notebooks/ itself on sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from notebooks.common import DATACLASS_SLOTS
+
+
+@dataclass(**DATACLASS_SLOTS)
 class LLMResponse:
     """Standardized LLM response format"""
     content: str
@@ -23,51 +49,346 @@ class LLMResponse:
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
     
+    # Optional AsyncTokenBucket throttling agenerate() calls
+    rate_limiter = None
+    # SDK async clients keyed by event loop (see _loop_client)
+    _async_clients = None
+    
     @abstractmethod
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate a response from the LLM"""
         pass
     
+    async def agenerate(self, prompt: str, **kwargs) -> LLMResponse:
+        """
+        Asynchronously generate a response from the LLM.
+        Providers without a native async client fall back to running
+        generate() in the default thread pool.
+        """
+        await self._throttle()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.generate, prompt, **kwargs))
+    
+    async def _throttle(self):
+        """Wait for a rate-limiter token, if this provider has a limiter"""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+    
+    def _loop_client(self, create):
+        """
+        Return this provider's SDK async client for the running event loop,
+        building it with create() on first use on that loop. The client's
+        httpx pool (including an HTTP/2 client from _sdk_http2_kwargs) cannot
+        be shared across loops, so each loop gets its own, closed with it.
+        """
+        if self._async_clients is None:
+            with _loop_clients_lock:
+                if self._async_clients is None:
+                    self._async_clients = weakref.WeakKeyDictionary()
+        return _loop_bound(self._async_clients, create)
+    
+    async def agenerate_many(self, prompts: List[str], **kwargs) -> List[LLMResponse]:
+        """Generate responses for many prompts concurrently, preserving order"""
+        return await asyncio.gather(*[self.agenerate(p, **kwargs) for p in prompts])
+    
+    async def agenerate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Yield the response text incrementally. Providers without native
+        streaming yield the whole response once; errors are raised.
+        """
+        response = await self.agenerate(prompt, **kwargs)
+        if response.error:
+            raise RuntimeError(response.error)
+        yield response.content
+    
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """Get list of available models"""
         pass
 
 
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ProviderHTTPError(Exception):
+    """HTTP error from a provider endpoint called without an SDK"""
+    
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    True for 429/5xx errors. Covers openai/anthropic APIStatusError
+    (.status_code), requests/httpx HTTP errors (.response.status_code)
+    and ProviderHTTPError.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status in RETRYABLE_STATUS_CODES
+
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _retry(fn, retries: int = 5, base: float = 0.5, cap: float = 30):
+    """Call fn(), retrying retryable errors with full-jitter backoff"""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not _is_retryable(e):
+                raise
+            time.sleep(_backoff_delay(attempt, base, cap))
+
+
+async def _aretry(fn, retries: int = 5, base: float = 0.5, cap: float = 30):
+    """Async variant of _retry(); fn is a zero-argument coroutine function"""
+    for attempt in range(retries + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt == retries or not _is_retryable(e):
+                raise
+            await asyncio.sleep(_backoff_delay(attempt, base, cap))
+
+
+class AsyncTokenBucket:
+    """
+    Client-side token-bucket rate limiter for async requests.
+    Tokens refill continuously at rate_per_sec up to burst. acquire() reserves
+    a token immediately (the balance may go negative) and then sleeps until
+    that reservation is covered, so no lock is needed and callers are served
+    in arrival order.
+    """
+    
+    def __init__(self, rate_per_sec: float, burst: Optional[float] = None):
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst if burst is not None else max(1.0, rate_per_sec)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+    
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: Optional[float] = None) -> "AsyncTokenBucket":
+        """Build a bucket from a requests-per-minute quota"""
+        return cls(requests_per_minute / 60.0, burst)
+    
+    async def acquire(self, tokens: float = 1):
+        """Take tokens, sleeping until the bucket can cover them"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_sec)
+        self._updated = now
+        self._tokens -= tokens
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate_per_sec)
+
+
+# Default client-side request quotas (requests per minute). These match the
+# lowest paid usage tiers; pass requests_per_minute to override.
+OPENAI_DEFAULT_RPM = 500
+ANTHROPIC_DEFAULT_RPM = 50
+
+
+# Async HTTP clients are bound to the event loop they were created on, so
+# every shared client is kept per running loop (see _loop_bound) and
+# registered here to be closed when that loop's work is done (see
+# _aclose_loop_clients). Loops from concurrent run_sync() calls each get
+# their own clients, so no loop closes a client another is still using.
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list]" = weakref.WeakKeyDictionary()
+_loop_clients_lock = threading.Lock()
+
+
+def _loop_bound(clients: "weakref.WeakKeyDictionary", create):
+    """
+    Return clients[running loop], building it with create() on first use
+    on that loop (or if it was closed) and registering it to be closed with
+    the loop. Entries for loops that have since closed are dropped.
+    """
+    loop = asyncio.get_running_loop()
+    with _loop_clients_lock:
+        client = clients.get(loop)
+        if client is None or getattr(client, "closed", False) is True:
+            for stale in [other for other in clients if other.is_closed()]:
+                del clients[stale]
+            for stale in [other for other in _loop_clients if other.is_closed()]:
+                del _loop_clients[stale]
+            client = clients[loop] = create()
+            _loop_clients.setdefault(loop, []).append(client)
+        return client
+
+
+async def _aclose_client(client):
+    """Close an httpx/SDK (aclose or async close) or aiohttp (close) client"""
+    close = getattr(client, "aclose", None) or client.close
+    await close()
+
+
+async def _aclose_loop_clients():
+    """Close every client registered on the running loop"""
+    with _loop_clients_lock:
+        clients = _loop_clients.pop(asyncio.get_running_loop(), [])
+    for client in clients:
+        try:
+            await _aclose_client(client)
+        except Exception:
+            pass
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code, closing the async
+    clients opened on its event loop afterwards. asyncio.run() cannot be
+    nested, so when a loop is already running in this thread (e.g. in
+    Jupyter) the coroutine runs on a private loop in a worker thread.
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await _aclose_loop_clients()
+    
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(main())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, main()).result()
+
+
+# Shared aiohttp sessions for raw OpenAI requests, one per event loop
+_openai_http_sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+
+def _get_openai_http_session():
+    """Return the module-level aiohttp.ClientSession for the running event loop"""
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("aiohttp package not installed. Install with: pip install aiohttp")
+    
+    return _loop_bound(_openai_http_sessions, lambda: aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=256),
+        timeout=aiohttp.ClientTimeout(total=60)
+    ))
+
+
+def _sdk_http2_kwargs(sdk) -> Dict[str, Any]:
+    """
+    http_client kwargs giving an OpenAI/Anthropic async client HTTP/2, so
+    concurrent requests multiplex over one connection. Empty (SDK default
+    HTTP/1.1 pool) unless h2 is installed and the SDK exposes its default
+    httpx client class.
+    """
+    if importlib.util.find_spec("h2") is None or not hasattr(sdk, "DefaultAsyncHttpxClient"):
+        return {}
+    return {"http_client": sdk.DefaultAsyncHttpxClient(http2=True)}
+
+
 class OpenAIProvider(LLMProvider):
     """OpenAI GPT provider"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
-        try:
-            from openai import OpenAI
-        except ImportError:
+    # When True, agenerate() POSTs to the REST API with aiohttp instead of
+    # going through the SDK's httpx transport, which scales poorly at high
+    # concurrency (50+ in-flight requests).
+    _use_raw_http = False
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo",
+                 use_raw_http: Optional[bool] = None,
+                 requests_per_minute: Optional[float] = OPENAI_DEFAULT_RPM):
+        # Only check the SDK is installed; importing it and building clients
+        # is deferred to first use (see the client properties)
+        if importlib.util.find_spec("openai") is None:
             raise ImportError("openai package not installed. Install with: pip install openai")
         
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not found in environment or provided")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self._client = None
         self.model = model
         self.provider_name = "openai"
+        if requests_per_minute:
+            self.rate_limiter = AsyncTokenBucket.per_minute(requests_per_minute)
+        if use_raw_http is not None:
+            self._use_raw_http = use_raw_http
+    
+    @property
+    def client(self):
+        """Synchronous OpenAI client, created on first use"""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key, max_retries=0)
+        return self._client
+    
+    @property
+    def async_client(self):
+        """Async OpenAI client for the running event loop"""
+        def create():
+            import openai
+            return openai.AsyncOpenAI(api_key=self.api_key, max_retries=0,
+                                      **_sdk_http2_kwargs(openai))
+        return self._loop_client(create)
     
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate response using OpenAI API"""
-        import time
-        
         model = kwargs.get("model", self.model)
         max_tokens = kwargs.get("max_tokens", 1000)
         temperature = kwargs.get("temperature", 0.7)
         
         try:
-            start_time = time.time()
-            response = self.client.chat.completions.create(
+            start_time = time.perf_counter()
+            response = _retry(lambda: self.client.chat.completions.create(
                 model=model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=self._messages(prompt, kwargs.get("system")),
                 max_tokens=max_tokens,
                 temperature=temperature
+            ))
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            
+            return LLMResponse(
+                content=response.choices[0].message.content,
+                model=model,
+                provider=self.provider_name,
+                tokens_used=response.usage.total_tokens if hasattr(response, 'usage') else None,
+                latency_ms=latency_ms
             )
-            latency_ms = (time.time() - start_time) * 1000
+        except Exception as e:
+            return LLMResponse(
+                content="",
+                model=model,
+                provider=self.provider_name,
+                error=str(e)
+            )
+    
+    async def agenerate(self, prompt: str, **kwargs) -> LLMResponse:
+        """Generate response using the async OpenAI client"""
+        if self._use_raw_http:
+            return await self._agenerate_raw(prompt, **kwargs)
+        
+        model = kwargs.get("model", self.model)
+        max_tokens = kwargs.get("max_tokens", 1000)
+        temperature = kwargs.get("temperature", 0.7)
+        
+        try:
+            start_time = time.perf_counter()
+            async def create():
+                await self._throttle()
+                return await self.async_client.chat.completions.create(
+                    model=model,
+                    messages=self._messages(prompt, kwargs.get("system")),
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+            
+            response = await _aretry(create)
+            latency_ms = (time.perf_counter() - start_time) * 1000
             
             return LLMResponse(
                 content=response.choices[0].message.content,
@@ -84,6 +405,76 @@ class OpenAIProvider(LLMProvider):
                 error=str(e)
             )
     
+    async def agenerate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream response text from the chat completions API (stream=True)"""
+        async def create():
+            await self._throttle()
+            return await self.async_client.chat.completions.create(
+                model=kwargs.get("model", self.model),
+                messages=self._messages(prompt, kwargs.get("system")),
+                max_tokens=kwargs.get("max_tokens", 1000),
+                temperature=kwargs.get("temperature", 0.7),
+                stream=True
+            )
+        
+        # Only opening the stream is retried; errors mid-stream are raised
+        stream = await _aretry(create)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def _agenerate_raw(self, prompt: str, **kwargs) -> LLMResponse:
+        """Generate response by POSTing to the chat completions endpoint with aiohttp"""
+        model = kwargs.get("model", self.model)
+        payload = {
+            "model": model,
+            "messages": self._messages(prompt, kwargs.get("system")),
+            "max_tokens": kwargs.get("max_tokens", 1000),
+            "temperature": kwargs.get("temperature", 0.7)
+        }
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        
+        async def post():
+            await self._throttle()
+            session = _get_openai_http_session()
+            async with session.post(OPENAI_CHAT_COMPLETIONS_URL, json=payload, headers=headers) as response:
+                result = await response.json()
+                if response.status >= 400:
+                    message = result.get("error", {}).get("message", response.reason)
+                    raise ProviderHTTPError(response.status, message)
+                return result
+        
+        try:
+            start_time = time.perf_counter()
+            result = await _aretry(post)
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            
+            usage = result.get("usage") or {}
+            return LLMResponse(
+                content=result["choices"][0]["message"]["content"],
+                model=model,
+                provider=self.provider_name,
+                tokens_used=usage.get("total_tokens"),
+                latency_ms=latency_ms
+            )
+        except Exception as e:
+            return LLMResponse(
+                content="",
+                model=model,
+                provider=self.provider_name,
+                error=str(e)
+            )
+    
+    @staticmethod
+    def _messages(prompt: str, system: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Chat messages for a prompt. A system prompt goes first so repeated
+        calls share a prefix, which OpenAI caches automatically (>= 1024 tokens).
+        """
+        if system:
+            return [{"role": "system", "content": system}, {"role": "user", "content": prompt}]
+        return [{"role": "user", "content": prompt}]
+    
     def get_available_models(self) -> List[str]:
         """Get list of available OpenAI models"""
         return [
@@ -97,42 +488,96 @@ class OpenAIProvider(LLMProvider):
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude provider"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-sonnet-20240229"):
-        try:
-            from anthropic import Anthropic
-        except ImportError:
+    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-sonnet-20240229",
+                 requests_per_minute: Optional[float] = ANTHROPIC_DEFAULT_RPM):
+        # Only check the SDK is installed; importing it and building clients
+        # is deferred to first use (see the client properties)
+        if importlib.util.find_spec("anthropic") is None:
             raise ImportError("anthropic package not installed. Install with: pip install anthropic")
         
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment or provided")
         
-        self.client = Anthropic(api_key=self.api_key)
+        self._client = None
         self.model = model
         self.provider_name = "anthropic"
+        if requests_per_minute:
+            self.rate_limiter = AsyncTokenBucket.per_minute(requests_per_minute)
+    
+    @property
+    def client(self):
+        """Synchronous Anthropic client, created on first use"""
+        if self._client is None:
+            from anthropic import Anthropic
+            self._client = Anthropic(api_key=self.api_key, max_retries=0)
+        return self._client
+    
+    @property
+    def async_client(self):
+        """Async Anthropic client for the running event loop"""
+        def create():
+            import anthropic
+            return anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0,
+                                            **_sdk_http2_kwargs(anthropic))
+        return self._loop_client(create)
     
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate response using Anthropic API"""
-        import time
-        
         model = kwargs.get("model", self.model)
         max_tokens = kwargs.get("max_tokens", 1000)
         temperature = kwargs.get("temperature", 0.7)
         
         try:
-            start_time = time.time()
-            response = self.client.messages.create(
+            start_time = time.perf_counter()
+            response = _retry(lambda: self.client.messages.create(
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
+                messages=[{"role": "user", "content": prompt}],
+                **self._system_kwargs(kwargs.get("system"))
+            ))
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            
+            content = self._extract_text(response.content)
+            
+            return LLMResponse(
+                content=content,
+                model=model,
+                provider=self.provider_name,
+                tokens_used=response.usage.input_tokens + response.usage.output_tokens if hasattr(response, 'usage') else None,
+                latency_ms=latency_ms
+            )
+        except Exception as e:
+            return LLMResponse(
+                content="",
+                model=model,
+                provider=self.provider_name,
+                error=str(e)
             )
-            latency_ms = (time.time() - start_time) * 1000
+    
+    async def agenerate(self, prompt: str, **kwargs) -> LLMResponse:
+        """Generate response using the async Anthropic client"""
+        model = kwargs.get("model", self.model)
+        max_tokens = kwargs.get("max_tokens", 1000)
+        temperature = kwargs.get("temperature", 0.7)
+        
+        try:
+            start_time = time.perf_counter()
+            async def create():
+                await self._throttle()
+                return await self.async_client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=[{"role": "user", "content": prompt}],
+                    **self._system_kwargs(kwargs.get("system"))
+                )
             
-            content = ""
-            if response.content:
-                # Anthropic returns a list of content blocks
-                content = "".join([block.text for block in response.content if hasattr(block, 'text')])
+            response = await _aretry(create)
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            
+            content = self._extract_text(response.content)
             
             return LLMResponse(
                 content=content,
@@ -149,6 +594,45 @@ class AnthropicProvider(LLMProvider):
                 error=str(e)
             )
     
+    async def agenerate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream response text from the Messages API (stream=True)"""
+        async def create():
+            await self._throttle()
+            return await self.async_client.messages.create(
+                model=kwargs.get("model", self.model),
+                max_tokens=kwargs.get("max_tokens", 1000),
+                temperature=kwargs.get("temperature", 0.7),
+                messages=[{"role": "user", "content": prompt}],
+                stream=True,
+                **self._system_kwargs(kwargs.get("system"))
+            )
+        
+        # Only opening the stream is retried; errors mid-stream are raised
+        stream = await _aretry(create)
+        async for event in stream:
+            if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                yield event.delta.text
+    
+    @staticmethod
+    def _system_kwargs(system: Optional[str]) -> Dict[str, Any]:
+        """
+        messages.create() arguments for a system prompt, marked with an
+        ephemeral cache_control breakpoint so Anthropic caches the prefix
+        across calls that reuse it
+        """
+        if not system:
+            return {}
+        return {"system": [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]}
+    
+    @staticmethod
+    def _extract_text(blocks) -> str:
+        """Join the text of Anthropic content blocks, fast-pathing the usual single block"""
+        if not blocks:
+            return ""
+        if len(blocks) == 1:
+            return getattr(blocks[0], "text", "")
+        return "".join(block.text for block in blocks if hasattr(block, "text"))
+    
     def get_available_models(self) -> List[str]:
         """Get list of available Anthropic models"""
         return [
@@ -158,47 +642,136 @@ class AnthropicProvider(LLMProvider):
         ]
 
 
+# Shared async HTTP clients for Ollama, one per running event loop
+_ollama_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _get_ollama_async_client():
+    """Return the module-level httpx.AsyncClient for the running event loop"""
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("httpx package not installed. Install with: pip install httpx")
+    
+    return _loop_bound(_ollama_async_clients, lambda: httpx.AsyncClient(
+        timeout=60,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    ))
+
+
 class OllamaProvider(LLMProvider):
     """Ollama local model provider"""
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama2"):
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama2",
+                 num_parallel: Optional[int] = None,
+                 requests_per_minute: Optional[float] = None):
+        """
+        Args:
+            base_url: Ollama server URL
+            model: Default model name
+            num_parallel: Max in-flight async requests. Should match the
+                server's OLLAMA_NUM_PARALLEL (defaults to that env var, or 4).
+            requests_per_minute: Optional client-side quota (unlimited by default)
+        """
         try:
             import requests
+            from requests.adapters import HTTPAdapter
         except ImportError:
             raise ImportError("requests package not installed. Install with: pip install requests")
         
         self.base_url = base_url
         self.model = model
         self.provider_name = "ollama"
-        self._requests = requests
+        if requests_per_minute:
+            self.rate_limiter = AsyncTokenBucket.per_minute(requests_per_minute)
+        
+        # Persistent session so repeated calls reuse keep-alive connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # A missing, non-numeric or non-positive OLLAMA_NUM_PARALLEL means
+        # the server default
+        try:
+            server_parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", ""))
+        except ValueError:
+            server_parallel = None
+        if server_parallel is not None and server_parallel < 1:
+            server_parallel = None
+        self.num_parallel = num_parallel or server_parallel or 4
+        if num_parallel and server_parallel != num_parallel:
+            warnings.warn(f"Start the Ollama server with OLLAMA_NUM_PARALLEL={num_parallel} "
+                          f"(and OLLAMA_MAX_LOADED_MODELS if using several models) so it can "
+                          f"serve {num_parallel} concurrent requests.", stacklevel=2)
+        # Concurrency limiters keyed by event loop
+        self._semaphores = weakref.WeakKeyDictionary()
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.num_parallel)
+        return semaphore
+    
+    def __del__(self):
+        session = getattr(self, "_session", None)
+        if session is not None:
+            session.close()
     
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate response using Ollama API"""
-        import time
-        
         model = kwargs.get("model", self.model)
         url = f"{self.base_url}/api/generate"
+        payload = self._build_payload(prompt, model, **kwargs)
         
-        payload = {
-            "model": model,
-            "prompt": prompt,
-            "stream": False
-        }
+        def post():
+            response = self._session.post(url, json=payload, timeout=60)
+            response.raise_for_status()
+            return response.json()
         
-        # Add optional parameters
-        if "max_tokens" in kwargs:
-            payload["options"] = {"num_predict": kwargs["max_tokens"]}
-        if "temperature" in kwargs:
-            if "options" not in payload:
-                payload["options"] = {}
-            payload["options"]["temperature"] = kwargs["temperature"]
+        try:
+            start_time = time.perf_counter()
+            result = _retry(post)
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            
+            return LLMResponse(
+                content=result.get("response", ""),
+                model=model,
+                provider=self.provider_name,
+                tokens_used=result.get("eval_count"),  # Ollama's approximate token count
+                latency_ms=latency_ms
+            )
+        except Exception as e:
+            return LLMResponse(
+                content="",
+                model=model,
+                provider=self.provider_name,
+                error=str(e)
+            )
+    
+    async def agenerate(self, prompt: str, **kwargs) -> LLMResponse:
+        """Generate response using Ollama API over a shared httpx.AsyncClient"""
+        model = kwargs.get("model", self.model)
+        url = f"{self.base_url}/api/generate"
+        payload = self._build_payload(prompt, model, **kwargs)
+        
+        async def post():
+            await self._throttle()
+            client = _get_ollama_async_client()
+            # Bound in-flight requests to what the server will run in parallel;
+            # extra requests would only queue server-side and inflate latency.
+            # Backoff sleeps happen outside the semaphore.
+            async with self._get_semaphore():
+                response = await client.post(url, json=payload)
+                response.raise_for_status()
+                return response.json()
         
         try:
-            start_time = time.time()
-            response = self._requests.post(url, json=payload, timeout=60)
-            response.raise_for_status()
-            result = response.json()
-            latency_ms = (time.time() - start_time) * 1000
+            start_time = time.perf_counter()
+            result = await _aretry(post)
+            latency_ms = (time.perf_counter() - start_time) * 1000
             
             return LLMResponse(
                 content=result.get("response", ""),
@@ -215,11 +788,57 @@ class OllamaProvider(LLMProvider):
                 error=str(e)
             )
     
+    async def agenerate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream response tokens from Ollama as they are generated.
+        Lowers time-to-first-token and lets callers stop early (e.g. once an
+        output exceeds a length limit) by breaking out of the loop.
+        """
+        model = kwargs.get("model", self.model)
+        url = f"{self.base_url}/api/generate"
+        payload = self._build_payload(prompt, model, stream=True, **kwargs)
+        
+        await self._throttle()
+        client = _get_ollama_async_client()
+        async with self._get_semaphore():
+            async with client.stream("POST", url, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+    
+    def _build_payload(self, prompt: str, model: str, stream: bool = False, **kwargs) -> Dict[str, Any]:
+        """Build the /api/generate request body"""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream
+        }
+        if kwargs.get("system"):
+            payload["system"] = kwargs["system"]
+        
+        # Add optional parameters
+        if "max_tokens" in kwargs:
+            payload["options"] = {"num_predict": kwargs["max_tokens"]}
+        if "temperature" in kwargs:
+            if "options" not in payload:
+                payload["options"] = {}
+            payload["options"]["temperature"] = kwargs["temperature"]
+        
+        return payload
+    
     def get_available_models(self) -> List[str]:
         """Get list of available Ollama models (requires API call)"""
         try:
             url = f"{self.base_url}/api/tags"
-            response = self._requests.get(url, timeout=5)
+            response = self._session.get(url, timeout=5)
             if response.status_code == 200:
                 models_data = response.json()
                 return [model["name"] for model in models_data.get("models", [])]
@@ -285,18 +904,254 @@ class ModelProviderFactory:
         return None
 
 
+class LLMCache:
+    """
+    In-memory LRU response cache with per-entry TTL.
+    Only deterministic calls (temperature == 0) are worth caching, so the
+    client decides what to store; this class just holds the entries.
+    
+    With a checkpoint file, every stored response is also appended to a JSONL
+    file and reloaded on the next run, so interrupted sweeps resume without
+    repeating completed calls.
+    
+    All methods hold self.lock, so one cache can be shared by the threads of
+    ProductionValidator; UnifiedLLMClient also updates its stats under it.
+    """
+    
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600,
+                 persist_path: Optional[str] = None, fsync_every: int = 50):
+        """
+        Args:
+            maxsize: Maximum number of entries kept in memory
+            ttl: Seconds before an entry expires
+            persist_path: Optional JSONL checkpoint file (see open_checkpoint)
+            fsync_every: Force checkpoint writes to disk every N entries
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.fsync_every = fsync_every
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._checkpoint = None
+        self._checkpoint_path = None
+        self._unsynced = 0
+        self.lock = threading.RLock()
+        if persist_path:
+            self.open_checkpoint(persist_path)
+    
+    @staticmethod
+    def make_key(namespace: str, prompt: str) -> str:
+        """
+        SHA-256 key over the prompt and its request namespace (the JSON of
+        provider, model, temperature and max_tokens)
+        """
+        raw = json.dumps({"namespace": namespace, "prompt": prompt}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Return the cached response, or None if missing or expired"""
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, response = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return response
+    
+    def set(self, key: str, response: LLMResponse):
+        """Store a response, evicting the least recently used entry if full"""
+        expires_at = time.time() + self.ttl
+        with self.lock:
+            self._put(key, expires_at, response)
+            
+            if self._checkpoint is not None:
+                self._checkpoint.write(json.dumps({
+                    "key": key,
+                    "expires_at": expires_at,
+                    "response": asdict(response)
+                }) + "\n")
+                self._unsynced += 1
+                if self._unsynced >= self.fsync_every:
+                    self.sync()
+    
+    def _put(self, key: str, expires_at: float, response: LLMResponse):
+        with self.lock:
+            self._entries[key] = (expires_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def open_checkpoint(self, path: str):
+        """
+        Load unexpired entries from a JSONL checkpoint file (if it exists) and
+        append all further entries to it. Truncated trailing lines from an
+        interrupted run are skipped.
+        """
+        with self.lock:
+            if self._checkpoint_path == path:
+                return
+            self.close()
+            
+            now = time.time()
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if record["expires_at"] > now:
+                            self._put(record["key"], record["expires_at"], LLMResponse(**record["response"]))
+            
+            # Line buffering hands each record to the OS as soon as it is written
+            self._checkpoint = open(path, "a", buffering=1)
+            self._checkpoint_path = path
+    
+    def sync(self):
+        """Flush and fsync the checkpoint file"""
+        with self.lock:
+            if self._checkpoint is not None:
+                self._checkpoint.flush()
+                os.fsync(self._checkpoint.fileno())
+                self._unsynced = 0
+    
+    def close(self):
+        """Sync and close the checkpoint file, if any"""
+        with self.lock:
+            if self._checkpoint is not None:
+                self.sync()
+                self._checkpoint.close()
+                self._checkpoint = None
+                self._checkpoint_path = None
+    
+    def clear(self):
+        """Drop all in-memory cached responses"""
+        with self.lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticCache:
+    """
+    Embedding-similarity response cache (second tier behind LLMCache).
+    Returns a stored response when a new prompt's cosine similarity to a
+    previously seen prompt meets the threshold, so trivial variations
+    ("test" * 100 vs "test" * 99) skip the LLM call.
+    
+    Entries are partitioned by namespace (provider/model/parameters) so a
+    response is only reused for a request with identical settings.
+    """
+    
+    def __init__(self, embed_fn, threshold: float = 0.95, initial_capacity: int = 64):
+        """
+        Args:
+            embed_fn: Callable mapping a prompt to a 1-D embedding vector,
+                e.g. SentenceTransformer("all-MiniLM-L6-v2").encode
+            threshold: Minimum cosine similarity for a hit
+            initial_capacity: Rows preallocated per namespace
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("numpy package not installed. Install with: pip install numpy")
+        
+        self._np = np
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.initial_capacity = initial_capacity
+        # namespace -> [matrix of unit-norm embeddings, responses, row count]
+        self._stores: Dict[str, list] = {}
+    
+    def _embed(self, prompt: str):
+        """Embed and L2-normalize a prompt so dot products are cosine similarities"""
+        np = self._np
+        emb = np.asarray(self.embed_fn(prompt), dtype=np.float32).ravel()
+        norm = np.linalg.norm(emb)
+        return emb / norm if norm else emb
+    
+    def get(self, namespace: str, prompt: str) -> Optional[LLMResponse]:
+        """Return the most similar cached response above threshold, or None"""
+        store = self._stores.get(namespace)
+        if store is None or store[2] == 0:
+            return None
+        
+        matrix, responses, count = store
+        sims = matrix[:count] @ self._embed(prompt)
+        best = int(sims.argmax())
+        if sims[best] >= self.threshold:
+            return responses[best]
+        return None
+    
+    def add(self, namespace: str, prompt: str, response: LLMResponse):
+        """Store a prompt embedding and its response"""
+        np = self._np
+        emb = self._embed(prompt)
+        store = self._stores.get(namespace)
+        if store is None:
+            store = [np.empty((self.initial_capacity, emb.shape[0]), dtype=np.float32), [], 0]
+            self._stores[namespace] = store
+        
+        matrix, responses, count = store
+        if count == matrix.shape[0]:
+            # Amortized O(1) append: double capacity instead of vstack per row
+            matrix = np.vstack([matrix, np.empty_like(matrix)])
+            store[0] = matrix
+        matrix[count] = emb
+        responses.append(response)
+        store[2] = count + 1
+    
+    def clear(self):
+        """Drop all cached embeddings and responses"""
+        self._stores.clear()
+    
+    def __len__(self) -> int:
+        return sum(store[2] for store in self._stores.values())
+
+
+PACKED_PROMPT_HEADER = (
+    "Answer each of the following independently. Start each answer with its "
+    "marker, e.g. [[1]], and do not add any other text.\n\n"
+)
+
+_PACKED_MARKER = re.compile(r"\[\[(\d+)\]\]")
+
+
+def _split_packed_response(content: str, count: int) -> Optional[List[str]]:
+    """Split a [[i]]-marked reply into count answers, or None if malformed"""
+    parts = _PACKED_MARKER.split(content)
+    # parts = [preamble, "1", answer1, "2", answer2, ...]
+    answers = {}
+    for index, answer in zip(parts[1::2], parts[2::2]):
+        answers[int(index)] = answer.strip()
+    
+    if sorted(answers) != list(range(1, count + 1)):
+        return None
+    return [answers[i] for i in range(1, count + 1)]
+
+
 class UnifiedLLMClient:
     """
     Unified client for working with multiple LLM providers.
     Provides a consistent interface regardless of provider.
     """
     
-    def __init__(self, provider: Optional[LLMProvider] = None):
+    def __init__(self, provider: Optional[LLMProvider] = None,
+                 cache: Optional[LLMCache] = None, use_cache: bool = True,
+                 semantic_cache: Optional[SemanticCache] = None):
         """
         Initialize with a specific provider or auto-detect.
         
         Args:
             provider: LLMProvider instance, or None to auto-detect
+            cache: LLMCache to use for deterministic calls, or None for a new one
+            use_cache: Set False to disable response caching entirely
+            semantic_cache: Optional SemanticCache consulted after an exact-match miss
         """
         if provider is None:
             provider = ModelProviderFactory.auto_detect_provider()
@@ -304,10 +1159,161 @@ class UnifiedLLMClient:
                 raise ValueError("No LLM provider available. Please set API keys or start Ollama.")
         
         self.provider = provider
+        self.cache = (cache or LLMCache()) if use_cache else None
+        self.semantic_cache = semantic_cache if use_cache else None
+        self.stats = {"hits": 0, "semantic_hits": 0, "misses": 0}
+    
+    def _cache_namespace(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        Return the request-parameter namespace for a call, or None if it must
+        not be cached. Only temperature == 0 calls are cached; pass
+        no_cache=True to bypass (e.g. when measuring output variance).
+        """
+        no_cache = kwargs.pop("no_cache", False)
+        if self.cache is None or no_cache or kwargs.get("temperature") != 0:
+            return None
+        return json.dumps({
+            "provider": self.provider.provider_name,
+            "model": kwargs.get("model", getattr(self.provider, "model", None)),
+            "temperature": kwargs.get("temperature"),
+            "max_tokens": kwargs.get("max_tokens"),
+            "system": kwargs.get("system")
+        }, sort_keys=True)
+    
+    def _cache_lookup(self, namespace: Optional[str], prompt: str) -> Optional[LLMResponse]:
+        """Look up a cached response (exact, then semantic) and update stats"""
+        if namespace is None:
+            return None
+        
+        cached = self.cache.get(LLMCache.make_key(namespace, prompt))
+        if cached is not None:
+            self._count("hits")
+            return cached
+        
+        if self.semantic_cache is not None:
+            cached = self.semantic_cache.get(namespace, prompt)
+            if cached is not None:
+                self._count("semantic_hits")
+                return cached
+        
+        self._count("misses")
+        return None
+    
+    def _count(self, stat: str):
+        """Increment a stats counter under the cache lock (thread-safe)"""
+        with self.cache.lock:
+            self.stats[stat] += 1
+    
+    def _cache_store(self, namespace: Optional[str], prompt: str, response: LLMResponse):
+        """Cache a successful response in both tiers"""
+        if namespace is None or response.error:
+            return
+        self.cache.set(LLMCache.make_key(namespace, prompt), response)
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(namespace, prompt, response)
     
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate a response using the configured provider"""
-        return self.provider.generate(prompt, **kwargs)
+        namespace = self._cache_namespace(kwargs)
+        cached = self._cache_lookup(namespace, prompt)
+        if cached is not None:
+            return cached
+        
+        response = self.provider.generate(prompt, **kwargs)
+        self._cache_store(namespace, prompt, response)
+        return response
+    
+    async def agenerate(self, prompt: str, **kwargs) -> LLMResponse:
+        """Asynchronously generate a response using the configured provider"""
+        namespace = self._cache_namespace(kwargs)
+        cached = self._cache_lookup(namespace, prompt)
+        if cached is not None:
+            return cached
+        
+        response = await self.provider.agenerate(prompt, **kwargs)
+        self._cache_store(namespace, prompt, response)
+        return response
+    
+    async def agenerate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream response text from the configured provider (not cached)"""
+        kwargs.pop("no_cache", None)
+        async for token in self.provider.agenerate_stream(prompt, **kwargs):
+            yield token
+    
+    async def agenerate_batch(self, prompts: List[str], batch_size: Optional[int] = None,
+                              **kwargs) -> List[LLMResponse]:
+        """
+        Generate responses for many prompts concurrently, preserving order.
+        
+        Args:
+            prompts: Prompts to run
+            batch_size: If set, pack up to this many prompts into each LLM call
+                (see _agenerate_packed) to amortize per-request overhead
+        """
+        if not batch_size or batch_size < 2:
+            return await asyncio.gather(*[self.agenerate(p, **dict(kwargs)) for p in prompts])
+        
+        chunks = [prompts[i:i + batch_size] for i in range(0, len(prompts), batch_size)]
+        packed = await asyncio.gather(*[self._agenerate_packed(c, **dict(kwargs)) for c in chunks])
+        return [response for chunk_responses in packed for response in chunk_responses]
+    
+    def generate_batch(self, prompts: List[str], batch_size: Optional[int] = None,
+                       **kwargs) -> List[LLMResponse]:
+        """Synchronous wrapper around agenerate_batch() (see run_sync)"""
+        return run_sync(self.agenerate_batch(prompts, batch_size=batch_size, **kwargs))
+    
+    async def _agenerate_packed(self, prompts: List[str], **kwargs) -> List[LLMResponse]:
+        """
+        Answer several prompts with one LLM call using numbered [[i]] markers.
+        Falls back to one call per prompt if the reply cannot be split into
+        exactly one answer per prompt.
+        """
+        if len(prompts) == 1:
+            return [await self.agenerate(prompts[0], **dict(kwargs))]
+        
+        packed_prompt = PACKED_PROMPT_HEADER + "\n".join(
+            f"[[{i}]] {prompt}" for i, prompt in enumerate(prompts, 1)
+        )
+        response = await self.agenerate(packed_prompt, **dict(kwargs))
+        answers = _split_packed_response(response.content, len(prompts)) if not response.error else None
+        if answers is None:
+            return await asyncio.gather(*[self.agenerate(p, **dict(kwargs)) for p in prompts])
+        
+        return [
+            LLMResponse(
+                content=answer,
+                model=response.model,
+                provider=response.provider,
+                latency_ms=response.latency_ms
+            )
+            for answer in answers
+        ]
+    
+    def as_prompt_fn(self, template: str = "{input}", **kwargs):
+        """
+        Wrap the client as a run_prompt_fn for ProductionValidator.
+        
+        The returned callable maps an input string to the response text ("" on
+        error) and exposes a .batch(inputs, batch_size=None) attribute that
+        ProductionValidator uses to run many inputs concurrently through
+        agenerate_batch(), plus a .cache attribute used for checkpointing.
+        
+        Args:
+            template: Prompt text with an {input} placeholder
+            **kwargs: Generation parameters passed to every call
+        """
+        def run_prompt(input_data: str) -> str:
+            response = self.generate(template.replace("{input}", input_data), **kwargs)
+            return response.content if not response.error else ""
+        
+        def run_batch(inputs: List[str], batch_size: Optional[int] = None) -> List[str]:
+            prompts = [template.replace("{input}", i) for i in inputs]
+            responses = self.generate_batch(prompts, batch_size=batch_size, **kwargs)
+            return [r.content if not r.error else "" for r in responses]
+        
+        run_prompt.batch = run_batch
+        run_prompt.cache = self.cache
+        return run_prompt
     
     def get_provider_name(self) -> str:
         """Get the name of the current provider"""
@@ -3,15 +3,38 @@ Production Validation Framework for Prompt Engineering
 Validates prompts for real-world deployment scenarios
 """
 
+import re
+import sys
 import json
+import time
+import asyncio
 import statistics
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-import hashlib
+from hashlib import blake2b
+from pathlib import Path
 
+try:
+    import ahocorasick  # Optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
 
-@dataclass
+# Import shared helpers through the notebooks package, even when this
+# module is loaded with notebooks/ itself on sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from notebooks.common import DATACLASS_SLOTS
+
+# Output starts with "{" after optional whitespace; matched in place
+# instead of allocating a stripped copy of the output
+_JSON_OBJECT_START = re.compile(r"\s*\{")
+
+
+@dataclass(**DATACLASS_SLOTS)
 class TestCase:
     """Single test case for prompt validation"""
     input_data: str
@@ -20,9 +43,38 @@ class TestCase:
     min_length: Optional[int] = None
     max_length: Optional[int] = None
     validation_rules: Optional[Dict] = None
+    _kw_lower: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _automaton: object = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Lowercased once so _score_output doesn't redo it on every call
+        self._kw_lower = tuple(keyword.lower() for keyword in self.expected_keywords or ())
+        self._automaton = None
+
+    def find_keywords(self, output_lower: str) -> int:
+        """
+        Count expected keywords occurring in an already-lowercased output.
+        Uses an Aho-Corasick automaton (built on first use) when pyahocorasick
+        is installed, so the scan is a single O(len(output)) pass for any
+        number of keywords.
+        """
+        if ahocorasick is None:
+            return sum(1 for keyword in self._kw_lower if keyword in output_lower)
+
+        if self._automaton is None:
+            automaton = ahocorasick.Automaton()
+            for keyword in set(self._kw_lower) - {""}:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+        # The empty keyword matches everything, as with the `in` operator
+        matched = {keyword for _, keyword in self._automaton.iter(output_lower)}
+        matched.add("")
+        return sum(1 for keyword in self._kw_lower if keyword in matched)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ValidationResult:
     """Result of a single validation test"""
     test_id: str
@@ -37,6 +89,13 @@ class ValidationResult:
         if self.timestamp is None:
             self.timestamp = datetime.now().isoformat()
 
+    def _to_dict(self) -> Dict:
+        """Shallow dict of the fields; all values are immutable, so no deep copy like asdict()"""
+        return {name: getattr(self, name) for name in _VALIDATION_RESULT_FIELDS}
+
+
+_VALIDATION_RESULT_FIELDS = tuple(f.name for f in fields(ValidationResult))
+
 
 class ProductionValidator:
     """
@@ -44,10 +103,22 @@ class ProductionValidator:
     Tests consistency, robustness, edge cases, and performance.
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, batch_size: Optional[int] = None):
+        """
+        Args:
+            max_workers: Threads used to call run_prompt_fn concurrently.
+                Set to 1 for functions that are not thread-safe.
+            batch_size: For batch-capable prompt functions, pack this many edge
+                cases into each LLM call (robustness and edge-case tests only)
+        """
+        self.max_workers = max_workers
+        self.batch_size = batch_size
         self.test_cases: Dict[str, List[TestCase]] = {}
         self.validation_results: List[ValidationResult] = []
-        self.edge_cases = self._generate_edge_cases()
+        # (input, category) pairs; categories are fixed, so compute them once
+        self.edge_cases: List[Tuple[str, str]] = [
+            (case, self._categorize_edge_case(case)) for case in self._generate_edge_cases()
+        ]
     
     def _generate_edge_cases(self) -> List[str]:
         """Generate common edge cases for testing"""
@@ -65,6 +136,42 @@ class ProductionValidator:
             "test" * 100,  # Repetitive content
         ]
     
+    def _run_inputs(self, run_prompt_fn, inputs: List[str],
+                    batch_size: Optional[int] = None) -> List[Tuple[Optional[str], Optional[Exception]]]:
+        """
+        Run run_prompt_fn over inputs, returning (output, error) pairs in order.
+        If the function exposes a .batch(inputs) attribute (see
+        UnifiedLLMClient.as_prompt_fn) all inputs are dispatched in one batch,
+        packed batch_size per LLM call if given; otherwise, or if the batch
+        function turns out not to support the call (TypeError or
+        NotImplementedError), calls are spread over a thread pool of
+        max_workers. Any other batch error is reported for every input.
+        """
+        batch_fn = getattr(run_prompt_fn, "batch", None)
+        if batch_fn is not None:
+            try:
+                outputs = batch_fn(inputs, batch_size=batch_size) if batch_size else batch_fn(inputs)
+                return [(output, None) for output in outputs]
+            except (TypeError, NotImplementedError):
+                pass
+            except Exception as e:
+                return [(None, e)] * len(inputs)
+        
+        def run_one(input_data: str) -> Tuple[Optional[str], Optional[Exception]]:
+            try:
+                return run_prompt_fn(input_data), None
+            except Exception as e:
+                return None, e
+        
+        return self._map(run_one, inputs)
+    
+    def _map(self, fn, inputs: List[str]) -> list:
+        """Map fn over inputs on the thread pool, preserving order"""
+        if self.max_workers <= 1 or len(inputs) <= 1:
+            return [fn(input_data) for input_data in inputs]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(inputs))) as executor:
+            return list(executor.map(fn, inputs))
+    
     def add_test_case(self, prompt_id: str, test_case: TestCase):
         """Add a test case for a specific prompt"""
         if prompt_id not in self.test_cases:
@@ -83,21 +190,18 @@ class ProductionValidator:
         outputs = []
         scores = []
         
-        for i in range(num_runs):
-            try:
-                output = run_prompt_fn(test_case.input_data)
-                outputs.append(output)
-                
-                # Score based on expected criteria
-                score = self._score_output(output, test_case)
-                scores.append(score)
-            except Exception as e:
-                return {"error": f"Error running prompt: {str(e)}"}
+        for output, error in self._run_inputs(run_prompt_fn, [test_case.input_data] * num_runs):
+            if error is not None:
+                return {"error": f"Error running prompt: {str(error)}"}
+            outputs.append(output)
+            
+            # Score based on expected criteria
+            score = self._score_output(output, test_case)
+            scores.append(score)
         
         # Calculate consistency metrics
         consistency_score = self._calculate_consistency(outputs)
-        avg_score = statistics.mean(scores)
-        std_dev = statistics.stdev(scores) if len(scores) > 1 else 0
+        avg_score, std_dev = self._mean_std(np.asarray(scores, dtype=np.float64))
         
         result = {
             "test_type": "consistency",
@@ -124,23 +228,23 @@ class ProductionValidator:
         edge_case_results = []
         passed_count = 0
         
-        for edge_case in self.edge_cases:
-            try:
-                output = run_prompt_fn(edge_case)
+        inputs = [case for case, _ in self.edge_cases]
+        for (_, category), (output, error) in zip(self.edge_cases, self._run_inputs(run_prompt_fn, inputs, self.batch_size)):
+            if error is None:
                 score = self._score_output(output, test_case)
                 passed = score >= 50  # Lower threshold for edge cases
                 edge_case_results.append({
-                    "input_type": self._categorize_edge_case(edge_case),
+                    "input_type": category,
                     "passed": passed,
                     "score": round(score, 2)
                 })
                 if passed:
                     passed_count += 1
-            except Exception as e:
+            else:
                 edge_case_results.append({
-                    "input_type": self._categorize_edge_case(edge_case),
+                    "input_type": category,
                     "passed": False,
-                    "error": str(e)
+                    "error": str(error)
                 })
         
         robustness_score = passed_count / len(self.edge_cases)
@@ -158,27 +262,31 @@ class ProductionValidator:
     
     def test_edge_cases(self, prompt_id: str, run_prompt_fn, custom_cases: Optional[List[str]] = None) -> Dict:
         """Test prompt with specific edge cases"""
-        cases = custom_cases or self.edge_cases
+        if custom_cases:
+            cases = [(case, self._categorize_edge_case(case)) for case in custom_cases]
+        else:
+            cases = self.edge_cases
         results = []
         
-        for case in cases:
-            try:
-                output = run_prompt_fn(case)
+        inputs = [case for case, _ in cases]
+        for (case, category), (output, error) in zip(cases, self._run_inputs(run_prompt_fn, inputs, self.batch_size)):
+            test_id = f"{prompt_id}_edge_{blake2b(case.encode(), digest_size=4).hexdigest()}"
+            if error is None:
                 test_result = ValidationResult(
-                    test_id=f"{prompt_id}_edge_{hashlib.md5(case.encode()).hexdigest()[:8]}",
+                    test_id=test_id,
                     passed=True,
                     score=100.0 if output else 0.0,
-                    message=f"Edge case handled: {self._categorize_edge_case(case)}",
+                    message=f"Edge case handled: {category}",
                     actual_output=output[:100] if output else None  # Truncate for storage
                 )
                 results.append(test_result)
-            except Exception as e:
+            else:
                 test_result = ValidationResult(
-                    test_id=f"{prompt_id}_edge_{hashlib.md5(case.encode()).hexdigest()[:8]}",
+                    test_id=test_id,
                     passed=False,
                     score=0.0,
-                    message=f"Edge case failed: {self._categorize_edge_case(case)}",
-                    error=str(e)
+                    message=f"Edge case failed: {category}",
+                    error=str(error)
                 )
                 results.append(test_result)
         
@@ -190,7 +298,7 @@ class ProductionValidator:
             "total_cases": len(cases),
             "passed": passed,
             "passed_percentage": round(passed / len(cases) * 100, 2),
-            "results": [asdict(r) for r in results]
+            "results": [r._to_dict() for r in results]
         }
     
     def test_performance(self, prompt_id: str, run_prompt_fn, num_iterations: int = 10) -> Dict:
@@ -198,26 +306,29 @@ class ProductionValidator:
         Test prompt performance metrics.
         Measures execution time, token usage (if available), etc.
         """
-        import time
-        
         if prompt_id not in self.test_cases:
             return {"error": f"No test cases found for prompt {prompt_id}"}
         
         test_case = self.test_cases[prompt_id][0]
         execution_times = []
         
-        for _ in range(num_iterations):
-            start_time = time.time()
+        def timed_run(input_data: str) -> Tuple[Optional[float], Optional[Exception]]:
+            # Time each call individually so concurrent runs still report per-call latency
+            start_time = time.perf_counter()
             try:
-                output = run_prompt_fn(test_case.input_data)
-                execution_time = time.time() - start_time
-                execution_times.append(execution_time)
+                run_prompt_fn(input_data)
+                return time.perf_counter() - start_time, None
             except Exception as e:
-                return {"error": f"Performance test failed: {str(e)}"}
+                return None, e
         
-        avg_time = statistics.mean(execution_times)
-        median_time = statistics.median(execution_times)
-        std_dev = statistics.stdev(execution_times) if len(execution_times) > 1 else 0
+        for execution_time, error in self._map(timed_run, [test_case.input_data] * num_iterations):
+            if error is not None:
+                return {"error": f"Performance test failed: {str(error)}"}
+            execution_times.append(execution_time)
+        
+        times = np.asarray(execution_times, dtype=np.float64)
+        avg_time, std_dev = self._mean_std(times)
+        median_time = float(np.median(times))
         
         # Performance score (lower is better, normalized to 0-100)
         # Assuming optimal time is < 2 seconds
@@ -230,19 +341,31 @@ class ProductionValidator:
             "avg_execution_time": round(avg_time, 3),
             "median_execution_time": round(median_time, 3),
             "std_deviation": round(std_dev, 3),
-            "min_time": round(min(execution_times), 3),
-            "max_time": round(max(execution_times), 3),
+            "min_time": round(float(times.min()), 3),
+            "max_time": round(float(times.max()), 3),
             "performance_score": round(performance_score, 2),
             "passed": avg_time < 5.0  # Pass if average < 5 seconds
         }
     
     def validate_in_production(self, prompt_id: str, run_prompt_fn, 
                               include_edge_cases: bool = True,
-                              include_performance: bool = True) -> Dict:
+                              include_performance: bool = True,
+                              checkpoint_path: Optional[str] = None) -> Dict:
         """
         Complete production validation suite.
         Runs all validation tests and provides overall production readiness score.
+        
+        checkpoint_path persists the prompt function's response cache (see
+        UnifiedLLMClient.as_prompt_fn) so a rerun after an interruption skips
+        deterministic calls that already completed.
         """
+        if checkpoint_path:
+            cache = getattr(run_prompt_fn, "cache", None)
+            if cache is not None:
+                cache.open_checkpoint(checkpoint_path)
+            else:
+                print("Warning: checkpoint_path ignored; run_prompt_fn has no response cache.")
+        
         results = {}
         overall_scores = []
         
@@ -272,6 +395,9 @@ class ProductionValidator:
                 results["performance"] = performance_result
                 overall_scores.append(performance_result.get("performance_score", 0))
         
+        if checkpoint_path and getattr(run_prompt_fn, "cache", None) is not None:
+            run_prompt_fn.cache.sync()
+        
         # Calculate overall production readiness score
         production_ready_score = statistics.mean(overall_scores) if overall_scores else 0
         
@@ -291,6 +417,32 @@ class ProductionValidator:
             "recommendations": self._generate_production_recommendations(results, production_ready_score)
         }
     
+    async def avalidate_in_production(self, prompt_id: str, arun_prompt_fn,
+                                      include_edge_cases: bool = True,
+                                      include_performance: bool = True) -> Dict:
+        """
+        Async variant of validate_in_production() for coroutine prompt functions.
+        The suite runs in a worker thread and schedules each call back onto the
+        running event loop, so batched inputs are awaited concurrently.
+        """
+        loop = asyncio.get_running_loop()
+        
+        def run_prompt(input_data: str) -> str:
+            return asyncio.run_coroutine_threadsafe(arun_prompt_fn(input_data), loop).result()
+        
+        def run_batch(inputs: List[str], batch_size: Optional[int] = None) -> List[str]:
+            # Coroutine functions are awaited individually; batch_size is ignored
+            async def gather_all():
+                return await asyncio.gather(*[arun_prompt_fn(i) for i in inputs])
+            return asyncio.run_coroutine_threadsafe(gather_all(), loop).result()
+        
+        run_prompt.batch = run_batch
+        return await loop.run_in_executor(None, partial(
+            self.validate_in_production, prompt_id, run_prompt,
+            include_edge_cases=include_edge_cases,
+            include_performance=include_performance
+        ))
+    
     def _score_output(self, output: str, test_case: TestCase) -> float:
         """Score output against test case criteria"""
         score = 0.0
@@ -298,7 +450,7 @@ class ProductionValidator:
         
         # Check output type
         if test_case.expected_output_type:
-            if test_case.expected_output_type == "json" and output.strip().startswith("{"):
+            if test_case.expected_output_type == "json" and _JSON_OBJECT_START.match(output):
                 score += 20
             elif test_case.expected_output_type == "list" and ("[" in output or "-" in output):
                 score += 20
@@ -306,9 +458,9 @@ class ProductionValidator:
                 score += 20
         
         # Check for expected keywords
-        if test_case.expected_keywords:
-            found_keywords = sum(1 for keyword in test_case.expected_keywords if keyword.lower() in output.lower())
-            keyword_score = (found_keywords / len(test_case.expected_keywords)) * 30
+        if test_case._kw_lower:
+            found_keywords = test_case.find_keywords(output.lower())
+            keyword_score = (found_keywords / len(test_case._kw_lower)) * 30
             score += keyword_score
         
         # Check length constraints
@@ -322,15 +474,21 @@ class ProductionValidator:
         
         return min(score, max_score)
     
+    @staticmethod
+    def _mean_std(values: np.ndarray) -> Tuple[float, float]:
+        """Mean and sample standard deviation (0 for fewer than 2 values) as Python floats"""
+        mean = float(values.mean())
+        std_dev = float(values.std(ddof=1)) if values.size > 1 else 0.0
+        return mean, std_dev
+    
     def _calculate_consistency(self, outputs: List[str]) -> float:
         """Calculate consistency score based on output similarity"""
         if len(outputs) < 2:
             return 1.0
         
         # Simple similarity: compare output lengths
-        lengths = [len(output) for output in outputs]
-        avg_length = statistics.mean(lengths)
-        std_dev = statistics.stdev(lengths) if len(lengths) > 1 else 0
+        lengths = np.fromiter((len(output) for output in outputs), dtype=np.int64, count=len(outputs))
+        avg_length, std_dev = self._mean_std(lengths)
         
         # Consistency score: lower std dev = higher consistency
         # Normalize to 0-1 scale (assuming max std dev of 100)
@@ -4,9 +4,115 @@ Provides immediate feedback on prompt quality
 """
 
 import re
+import sys
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+try:
+    import ahocorasick  # Optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# (score key, threshold, message): the message is shown when the score is below the threshold
+_FEEDBACK_RULES = (
+    ('clarity_score', 0.7, "**Clarity**: Use shorter, clearer sentences (optimal: 15-25 words per sentence)"),
+    ('specificity_score', 0.7, "**Specificity**: Replace vague words ('good', 'nice') with concrete details"),
+    ('context_score', 0.5, "**Context**: Add a clear role: 'You are a [specific role]...'"),
+    ('structure_score', 0.6, "**Structure**: Organize your prompt with clear sections or numbered points"),
+    ('examples_score', 0.5, "**Examples**: Include examples or format guidance: 'Like this: [example]'"),
+    ('audience_score', 0.5, "**Audience**: Define your audience: 'for [specific group] who [specific situation]'"),
+    ('length_score', 0.5, "**Length**: Specify output length: '200 words', '3 paragraphs', etc."),
+    ('requirements_score', 0.5, "**Requirements**: List specific requirements: 'Must include...', 'Should contain...'"),
+)
+_EXCELLENT_FEEDBACK = "**Excellent!** Your prompt follows best practices across all criteria."
+
+# (score keys, threshold, message): shown when every listed score is below the threshold
+_SUGGESTION_RULES = (
+    # Priority-based suggestions
+    (('overall_score',), 70, "**Priority**: Focus on clarity and specificity - these are the most important factors"),
+    (('context_score',), 0.5, "**Quick win**: Start with 'You are a [role]' to immediately improve context"),
+    (('specificity_score',), 0.6, "**Quick win**: Add specific numbers, names, or concrete details"),
+    (('clarity_score', 'structure_score'), 0.7, "**Structure tip**: Break long sentences into shorter ones, use bullet points"),
+)
+
+# Interned so each message is a single shared object across all results,
+# which downstream code can compare with `is`
+_FEEDBACK_RULES = tuple((key, threshold, sys.intern(message)) for key, threshold, message in _FEEDBACK_RULES)
+_SUGGESTION_RULES = tuple((keys, threshold, sys.intern(message)) for keys, threshold, message in _SUGGESTION_RULES)
+_EXCELLENT_FEEDBACK = sys.intern(_EXCELLENT_FEEDBACK)
+
+
+# Grade boundaries (percent); bisect_right(_GRADE_CUTOFFS, pct) indexes GRADE_LABELS
+_GRADE_CUTOFFS = (50, 60, 70, 80, 90)
+GRADE_LABELS = (
+    "F (Failed - Complete Revision Required)",
+    "D (Poor - Needs Major Revision)",
+    "C (Needs Improvement)",
+    "B (Good)",
+    "A (Very Good)",
+    "A+ (Excellent)",
+)
+GRADE_LABELS = tuple(sys.intern(label) for label in GRADE_LABELS)
+
+# Weighted criteria, in the order _component_scores returns them
+_WEIGHTED_CRITERIA = ('clarity', 'specificity', 'context', 'structure', 'examples')
+
+# Score added per CLEAR indicator found, capped at 1.0 per category
+_INDICATOR_WEIGHTS = {
+    'context': 0.5,       # Role and context setting
+    'length': 0.5,        # Output length specified
+    'examples': 0.3,      # Examples or format guidance
+    'audience': 0.4,      # Target audience defined
+    'requirements': 0.3   # Specific requirements listed
+}
+
+# A run of sentence terminators or line breaks ends a sentence
+_SENTENCE_END_RE = re.compile(r'[.!?\n]+')
+
+# Prompts shorter than this (ignoring surrounding whitespace) are scored
+# as empty without running any checks
+_MIN_PROMPT_CHARS = 5
+_EMPTY_BREAKDOWN = dict.fromkeys([
+    'clarity_score', 'specificity_score', 'context_score', 'structure_score',
+    'examples_score', 'audience_score', 'requirements_score', 'length_score'
+], 0.0)
+_EMPTY_RESULT = {
+    'overall_score': 0.0,
+    'breakdown': _EMPTY_BREAKDOWN,
+    'weighted_scores': dict.fromkeys(['clarity', 'specificity', 'context', 'structure', 'examples'], 0.0),
+    'feedback': [message for _, _, message in _FEEDBACK_RULES],
+    'suggestions': [message for _, _, message in _SUGGESTION_RULES],
+    'grade': GRADE_LABELS[0],
+    'grade_index': 0
+}
+
+
+def _compile_indicators(indicators: List[str]) -> Tuple[re.Pattern, Dict[str, frozenset]]:
+    """Build a single-pass matcher for a list of indicator phrases.
+
+    The zero-width lookahead reports a match at every position and longest
+    alternatives are tried first, so the only hits it can miss are shorter
+    indicators nested inside a longer one; ``implied`` maps each indicator
+    to the indicators it contains so those are counted too.
+    """
+    ordered = sorted(set(indicators), key=len, reverse=True)
+    pattern = re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))')
+    implied = {w: frozenset(v for v in ordered if v in w) for w in ordered}
+    return pattern, implied
+
+
 class PromptValidator:
+    # No per-instance __dict__; scoring reads these attributes on every call
+    __slots__ = (
+        'clear_framework', 'criteria_weights', 'specificity_words', 'structure_words',
+        '_struct_re', '_categories', '_all_indicators', '_category_slices',
+        '_ac', '_indicator_patterns', '_score_cached'
+    )
+    
     def __init__(self):
         """Enhanced Prompt Validator with multi-factor weighted scoring"""
         # CLEAR framework indicators
@@ -26,125 +132,219 @@ class PromptValidator:
             'structure': 0.15,    # Well-structured prompt
             'examples': 0.15      # Examples and format guidance
         }
+        
+        # Vocabulary for specificity and structure checks
+        self.specificity_words = {
+            'vague': ['good', 'nice', 'great', 'awesome', 'help', 'some', 'thing'],
+            'specific': ['exactly', 'specifically', 'must', 'should', 'include', 'format']
+        }
+        self.structure_words = {
+            'question': ['what', 'how', 'why', 'when', 'where', 'who'],
+            'action': ['write', 'create', 'generate', 'analyze', 'explain', 'describe', 'list']
+        }
+        
+        self._struct_re = re.compile(r'\d+\.|[-*•]')
+        
+        # Every indicator in one flat tuple; each category owns a slice of it.
+        # Action verbs are left out: _check_structure counts every occurrence
+        categories = {**self.clear_framework, **self.specificity_words,
+                      'question': self.structure_words['question']}
+        self._categories = tuple(categories)
+        self._all_indicators = tuple(word for words in categories.values() for word in words)
+        self._category_slices = {}
+        offset = 0
+        for category, words in categories.items():
+            self._category_slices[category] = slice(offset, offset + len(words))
+            offset += len(words)
+        
+        # A single Aho-Corasick automaton over the flat table, falling back
+        # to one precompiled pattern per category
+        self._ac = None
+        self._indicator_patterns = {}
+        if ahocorasick is not None:
+            # Each hit carries the indices of its categories, so tallying is
+            # a list increment with no lookups
+            indicator_categories = {}
+            for index, category in enumerate(self._categories):
+                for word in self._all_indicators[self._category_slices[category]]:
+                    indicator_categories.setdefault(word, []).append(index)
+            self._ac = ahocorasick.Automaton()
+            for word, indices in indicator_categories.items():
+                self._ac.add_word(word, (word, tuple(indices)))
+            self._ac.make_automaton()
+        else:
+            self._indicator_patterns = {
+                category: _compile_indicators(self._all_indicators[self._category_slices[category]])
+                for category in self._categories
+            }
+        
+        # Repeat validations of the same prompt (e.g. dashboard reruns) are
+        # served from a per-instance LRU cache
+        self._score_cached = lru_cache(maxsize=512)(self._score_prompt)
+    
+    def _tally_indicators(self, prompt_lower: str) -> Dict[str, int]:
+        """Count how many distinct indicators of each category appear in the prompt"""
+        if self._ac is not None:
+            counts = [0] * len(self._categories)
+            for _, indices in {hit for _, hit in self._ac.iter(prompt_lower)}:
+                for index in indices:
+                    counts[index] += 1
+            return dict(zip(self._categories, counts))
+        
+        counts = {}
+        for category, (pattern, implied) in self._indicator_patterns.items():
+            found = set()
+            for match in set(pattern.findall(prompt_lower)):
+                found |= implied[match]
+            counts[category] = len(found)
+        return counts
     
     def score_prompt(self, prompt: str) -> Dict:
-        """Score a prompt based on multi-factor weighted system and CLEAR framework"""
-        prompt_lower = prompt.lower()
-        
-        # Calculate individual component scores
-        clarity_score = self._check_clarity(prompt)
-        specificity_score = self._check_specificity(prompt)
-        context_score = self._check_context(prompt_lower)
-        structure_score = self._check_structure(prompt, prompt_lower)
-        examples_score = self._check_examples(prompt_lower)
+        """
+        Score a prompt based on multi-factor weighted system and CLEAR framework.
+        Scores are unrounded floats (overall and weighted scores 0-100,
+        breakdown 0-1); round them when displaying.
+        """
+        if len(prompt.strip()) < _MIN_PROMPT_CHARS:
+            return self._copy_result(_EMPTY_RESULT)
+        return self._copy_result(self._score_cached(prompt))
+    
+    def score_batch(self, prompts: List[str]) -> List[Dict]:
+        """Score many prompts (A/B variants, evaluation sets); duplicates are scored once"""
+        unique = [p for p in dict.fromkeys(prompts) if len(p.strip()) >= _MIN_PROMPT_CHARS]
+        scored = {}
+        if unique:
+            # Component scores for the whole batch as one (N, 8) array, so the
+            # weighted sums and grades are computed column-wise
+            components = np.array([self._component_scores(p) for p in unique], dtype=np.float64)
+            weights = np.array([self.criteria_weights[k] for k in _WEIGHTED_CRITERIA], dtype=np.float64)
+            weighted = components[:, :len(_WEIGHTED_CRITERIA)] * weights
+            overall = weighted.sum(axis=1)
+            grades = np.searchsorted(_GRADE_CUTOFFS, overall * 100, side='right')
+            
+            for prompt, comps, row, total, grade in zip(unique, components.tolist(), weighted.tolist(),
+                                                         overall.tolist(), grades.tolist()):
+                scored[prompt] = self._build_result(prompt, comps, dict(zip(_WEIGHTED_CRITERIA, row)),
+                                                    total, grade)
+        
+        return [self._copy_result(scored.get(prompt, _EMPTY_RESULT)) for prompt in prompts]
+    
+    @staticmethod
+    def _copy_result(result: Dict) -> Dict:
+        """Copy the containers so callers can't mutate a cached result"""
+        return {
+            **result,
+            'breakdown': dict(result['breakdown']),
+            'weighted_scores': dict(result['weighted_scores']),
+            'feedback': list(result['feedback']),
+            'suggestions': list(result['suggestions'])
+        }
+    
+    def _score_prompt(self, prompt: str) -> Dict:
+        components = self._component_scores(prompt)
         
         # Weighted overall score calculation
         weighted_scores = {
-            'clarity': clarity_score * self.criteria_weights['clarity'],
-            'specificity': specificity_score * self.criteria_weights['specificity'],
-            'context': context_score * self.criteria_weights['context'],
-            'structure': structure_score * self.criteria_weights['structure'],
-            'examples': examples_score * self.criteria_weights['examples']
+            key: score * self.criteria_weights[key]
+            for key, score in zip(_WEIGHTED_CRITERIA, components)
         }
-        
         overall_score = sum(weighted_scores.values())
         
+        return self._build_result(prompt, components, weighted_scores, overall_score,
+                                  self._get_grade_index(overall_score))
+    
+    def _component_scores(self, prompt: str) -> Tuple[float, ...]:
+        """Component scores: the _WEIGHTED_CRITERIA, then audience, requirements and length"""
+        # Tokenize once and share the results with every checker
+        prompt_lower = prompt.lower()
+        word_count = len(prompt.split())
+        # Count sentence breaks rather than building the list of sentences
+        sentence_count = len(_SENTENCE_END_RE.findall(prompt)) + 1
+        # Two non-empty paragraphs exist exactly when a blank-line break
+        # remains after trimming the ends, so no paragraph list is built
+        multi_paragraph = '\n\n' in prompt.strip()
+        counts = self._tally_indicators(prompt_lower)
+        
+        return (
+            self._check_clarity(word_count, sentence_count),
+            self._check_specificity(counts, word_count),
+            self._check_indicators(counts, 'context'),
+            self._check_structure(prompt_lower, multi_paragraph, counts),
+            self._check_indicators(counts, 'examples'),
+            self._check_indicators(counts, 'audience'),
+            self._check_indicators(counts, 'requirements'),
+            self._check_indicators(counts, 'length')
+        )
+    
+    def _build_result(self, prompt: str, components: Tuple[float, ...],
+                      weighted_scores: Dict[str, float], overall_score: float, grade_index: int) -> Dict:
+        """Assemble the score_prompt result from precomputed scores"""
+        clarity, specificity, context, structure, examples, audience, requirements, length = components
+        
         # Detailed breakdown for feedback
         breakdown = {
-            'clarity_score': round(clarity_score, 2),
-            'specificity_score': round(specificity_score, 2),
-            'context_score': round(context_score, 2),
-            'structure_score': round(structure_score, 2),
-            'examples_score': round(examples_score, 2),
-            'audience_score': self._check_audience(prompt_lower),
-            'requirements_score': self._check_requirements(prompt_lower),
-            'length_score': self._check_length_specification(prompt_lower)
+            'clarity_score': clarity,
+            'specificity_score': specificity,
+            'context_score': context,
+            'structure_score': structure,
+            'examples_score': examples,
+            'audience_score': audience,
+            'requirements_score': requirements,
+            'length_score': length
         }
         
         return {
-            'overall_score': round(overall_score * 100, 2),  # Convert to 0-100 scale
+            'overall_score': overall_score * 100,  # Convert to 0-100 scale
             'breakdown': breakdown,
-            'weighted_scores': {k: round(v * 100, 2) for k, v in weighted_scores.items()},
+            'weighted_scores': {k: v * 100 for k, v in weighted_scores.items()},
             'feedback': self._generate_feedback(breakdown, prompt),
             'suggestions': self._generate_suggestions(breakdown, prompt),
-            'grade': self._get_grade(overall_score)
+            'grade': GRADE_LABELS[grade_index],
+            'grade_index': grade_index
         }
     
-    def _check_structure(self, prompt: str, prompt_lower: str) -> float:
+    def _check_structure(self, prompt_lower: str, multi_paragraph: bool, counts: Dict[str, int]) -> float:
         """Check if prompt is well-structured (has clear sections, logical flow)"""
         score = 0.0
         
         # Check for clear sections (paragraphs or line breaks)
-        paragraphs = [p.strip() for p in prompt.split('\n\n') if p.strip()]
-        if len(paragraphs) > 1:
+        if multi_paragraph:
             score += 0.3  # Multiple paragraphs suggest structure
         
         # Check for numbered lists or bullet points (structure indicators)
-        if re.search(r'\d+\.|[-*•]', prompt):
+        if self._struct_re.search(prompt_lower):
             score += 0.2
         
         # Check for question words (structured thinking)
-        question_words = ['what', 'how', 'why', 'when', 'where', 'who']
-        if any(qw in prompt_lower for qw in question_words):
+        if counts['question']:
             score += 0.2
         
-        # Check for action verbs (clear directives)
-        action_verbs = ['write', 'create', 'generate', 'analyze', 'explain', 'describe', 'list']
-        action_count = sum(1 for verb in action_verbs if verb in prompt_lower)
+        # Check for action verbs (clear directives); repeats count too
+        action_count = sum(map(prompt_lower.count, self.structure_words['action']))
         score += min(action_count * 0.1, 0.3)
         
         return min(score, 1.0)
     
-    def _check_context(self, prompt: str) -> float:
-        """Check if prompt sets proper context/role"""
-        context_indicators = self.clear_framework['context']
-        found = sum(1 for indicator in context_indicators if indicator in prompt)
-        return min(found * 0.5, 1.0)
-    
-    def _check_length_specification(self, prompt: str) -> float:
-        """Check if prompt specifies output length"""
-        length_indicators = self.clear_framework['length']
-        found = sum(1 for indicator in length_indicators if indicator in prompt)
-        return min(found * 0.5, 1.0)
-    
-    def _check_examples(self, prompt: str) -> float:
-        """Check if prompt provides examples or format guidance"""
-        example_indicators = self.clear_framework['examples']
-        found = sum(1 for indicator in example_indicators if indicator in prompt)
-        return min(found * 0.3, 1.0)
-    
-    def _check_audience(self, prompt: str) -> float:
-        """Check if prompt defines target audience"""
-        audience_indicators = self.clear_framework['audience']
-        found = sum(1 for indicator in audience_indicators if indicator in prompt)
-        return min(found * 0.4, 1.0)
-    
-    def _check_requirements(self, prompt: str) -> float:
-        """Check if prompt lists specific requirements"""
-        req_indicators = self.clear_framework['requirements']
-        found = sum(1 for indicator in req_indicators if indicator in prompt)
-        return min(found * 0.3, 1.0)
-    
-    def _check_specificity(self, prompt: str) -> float:
+    def _check_indicators(self, counts: Dict[str, int], category: str) -> float:
+        """Score a CLEAR category (context, length, examples, audience, requirements) by indicators found"""
+        return min(counts[category] * _INDICATOR_WEIGHTS[category], 1.0)
+    
+    def _check_specificity(self, counts: Dict[str, int], word_count: int) -> float:
         """Check for specific vs vague language"""
-        vague_words = ['good', 'nice', 'great', 'awesome', 'help', 'some', 'thing']
-        specific_words = ['exactly', 'specifically', 'must', 'should', 'include', 'format']
-        
-        vague_count = sum(1 for word in vague_words if word in prompt.lower())
-        specific_count = sum(1 for word in specific_words if word in prompt.lower())
+        vague_count = counts['vague']
+        specific_count = counts['specific']
         
-        if len(prompt.split()) == 0:
+        if word_count == 0:
             return 0
         
-        specificity_ratio = specific_count / max(len(prompt.split()) * 0.1, 1)
-        vague_penalty = vague_count / max(len(prompt.split()) * 0.1, 1)
+        specificity_ratio = specific_count / max(word_count * 0.1, 1)
+        vague_penalty = vague_count / max(word_count * 0.1, 1)
         
         return max(0, min(1, specificity_ratio - vague_penalty))
     
-    def _check_clarity(self, prompt: str) -> float:
+    def _check_clarity(self, word_count: int, sentence_count: int) -> float:
         """Check for clear, actionable language"""
-        sentences = prompt.split('.')
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / max(len(sentences), 1)
+        avg_sentence_length = word_count / max(sentence_count, 1)
         
         # Optimal sentence length is 15-25 words
         if 15 <= avg_sentence_length <= 25:
@@ -156,73 +356,24 @@ class PromptValidator:
     
     def _generate_feedback(self, scores: Dict, prompt: str) -> List[str]:
         """Generate specific feedback for improvement"""
-        feedback = []
-        
-        if scores.get('clarity_score', 0) < 0.7:
-            feedback.append("**Clarity**: Use shorter, clearer sentences (optimal: 15-25 words per sentence)")
-        
-        if scores.get('specificity_score', 0) < 0.7:
-            feedback.append("**Specificity**: Replace vague words ('good', 'nice') with concrete details")
-        
-        if scores.get('context_score', 0) < 0.5:
-            feedback.append("**Context**: Add a clear role: 'You are a [specific role]...'")
-        
-        if scores.get('structure_score', 0) < 0.6:
-            feedback.append("**Structure**: Organize your prompt with clear sections or numbered points")
-        
-        if scores.get('examples_score', 0) < 0.5:
-            feedback.append("**Examples**: Include examples or format guidance: 'Like this: [example]'")
-        
-        if scores.get('audience_score', 0) < 0.5:
-            feedback.append("**Audience**: Define your audience: 'for [specific group] who [specific situation]'")
-        
-        if scores.get('length_score', 0) < 0.5:
-            feedback.append("**Length**: Specify output length: '200 words', '3 paragraphs', etc.")
-        
-        if scores.get('requirements_score', 0) < 0.5:
-            feedback.append("**Requirements**: List specific requirements: 'Must include...', 'Should contain...'")
-        
-        if not feedback:
-            feedback.append("**Excellent!** Your prompt follows best practices across all criteria.")
-        
-        return feedback
+        feedback = [message for key, threshold, message in _FEEDBACK_RULES
+                    if scores.get(key, 0) < threshold]
+        return feedback or [_EXCELLENT_FEEDBACK]
     
     def _generate_suggestions(self, scores: Dict, prompt: str) -> List[str]:
         """Generate actionable improvement suggestions"""
-        suggestions = []
-        
-        # Priority-based suggestions
-        if scores.get('overall_score', 0) < 70:
-            suggestions.append("**Priority**: Focus on clarity and specificity - these are the most important factors")
-        
-        if scores.get('context_score', 0) < 0.5:
-            suggestions.append("**Quick win**: Start with 'You are a [role]' to immediately improve context")
-        
-        if scores.get('specificity_score', 0) < 0.6:
-            suggestions.append("**Quick win**: Add specific numbers, names, or concrete details")
-        
-        if all(s < 0.7 for s in [scores.get('clarity_score', 0), scores.get('structure_score', 0)]):
-            suggestions.append("**Structure tip**: Break long sentences into shorter ones, use bullet points")
-        
-        return suggestions
+        return [message for keys, threshold, message in _SUGGESTION_RULES
+                if all(scores.get(key, 0) < threshold for key in keys)]
     
     def _get_grade(self, score: float) -> str:
         """Convert score to letter grade (score is 0-1, needs to be converted for 0-100 scale)"""
+        return GRADE_LABELS[self._get_grade_index(score)]
+    
+    def _get_grade_index(self, score: float) -> int:
+        """Index into GRADE_LABELS for a 0-1 score (0 = F ... 5 = A+)"""
         # Score is 0-1, convert to percentage for grading
         percentage = score * 100
-        
-        if percentage >= 90:
-            return "A+ (Excellent)"
-        elif percentage >= 80:
-            return "A (Very Good)"
-        elif percentage >= 70:
-            return "B (Good)"
-        elif percentage >= 60:
-            return "C (Needs Improvement)"
-        elif percentage >= 50:
-            return "D (Poor - Needs Major Revision)"
-        else:
-            return "F (Failed - Complete Revision Required)"
+        return bisect_right(_GRADE_CUTOFFS, percentage)
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -231,7 +382,7 @@ if __name__ == "__main__":
     # Test with a bad prompt
     bad_prompt = "Write me something good about marketing"
     result = validator.score_prompt(bad_prompt)
-    print(f"Bad Prompt Score: {result['overall_score']} - {result['grade']}")
+    print(f"Bad Prompt Score: {result['overall_score']:.2f} - {result['grade']}")
     print("Feedback:", result['feedback'])
     
     # Test with a good prompt
@@ -242,5 +393,5 @@ if __name__ == "__main__":
     Tone should be friendly but professional."""
     
     result = validator.score_prompt(good_prompt)
-    print(f"\nGood Prompt Score: {result['overall_score']} - {result['grade']}")
+    print(f"\nGood Prompt Score: {result['overall_score']:.2f} - {result['grade']}")
     print("Feedback:", result['feedback'])
\ No newline at end of file
@@ -9,14 +9,10 @@ import os
 from pathlib import Path
 
 # Add notebooks directory to path
+# Tool modules are imported by the pages that use them, so a rerun of the
+# Home page doesn't load the validators or LLM SDKs
 sys.path.append(str(Path(__file__).parent / "notebooks"))
 
-from prompt_validator import PromptValidator
-from production_validator import ProductionValidator, TestCase
-from model_providers import UnifiedLLMClient, ModelProviderFactory
-from ab_testing_framework import PromptABTester
-from progress_tracker import ProgressTracker
-
 # Page configuration
 st.set_page_config(
     page_title="AI Prompt Engineering Dashboard",
@@ -57,27 +53,40 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def initialize_session_state():
-    """Initialize session state variables"""
-    if 'validator' not in st.session_state:
-        st.session_state.validator = PromptValidator()
-    if 'prod_validator' not in st.session_state:
+@st.cache_resource
+def _get_prompt_validator():
+    """Process-wide validator; it holds no per-user state, so all sessions share one"""
+    from prompt_validator import PromptValidator
+    return PromptValidator()
+
+
+@st.cache_data(max_entries=512)
+def _cached_score(prompt: str) -> dict:
+    """Score a prompt, reusing the result across reruns with the same text"""
+    return _get_prompt_validator().score_prompt(prompt)
+
+
+def initialize_session_state(*keys):
+    """Initialize the session state variables a page needs"""
+    if 'prod_validator' in keys and 'prod_validator' not in st.session_state:
+        from production_validator import ProductionValidator
         st.session_state.prod_validator = ProductionValidator()
-    if 'ab_tester' not in st.session_state:
+    if 'ab_tester' in keys and 'ab_tester' not in st.session_state:
+        from ab_testing_framework import PromptABTester
         st.session_state.ab_tester = PromptABTester()
-    if 'llm_client' not in st.session_state:
+    if 'llm_client' in keys and 'llm_client' not in st.session_state:
         try:
+            from model_providers import UnifiedLLMClient
             st.session_state.llm_client = UnifiedLLMClient()
         except:
             st.session_state.llm_client = None
-    if 'progress_tracker' not in st.session_state:
+    if 'progress_tracker' in keys and 'progress_tracker' not in st.session_state:
+        from progress_tracker import ProgressTracker
         st.session_state.progress_tracker = ProgressTracker()
 
 
 def main():
     """Main application"""
-    initialize_session_state()
-    
     # Sidebar navigation
     st.sidebar.title("Prompt Engineering Tools")
     page = st.sidebar.radio(
@@ -162,7 +171,7 @@ def show_prompt_validator():
     
     if validate_button and prompt:
         with st.spinner("Analyzing prompt..."):
-            result = st.session_state.validator.score_prompt(prompt)
+            result = _cached_score(prompt)
         
         # Overall score
         score = result['overall_score']
@@ -211,6 +220,9 @@ def show_prompt_validator():
 
 def show_production_validator():
     """Production Validator page"""
+    from production_validator import TestCase
+    initialize_session_state('prod_validator', 'llm_client')
+    
     st.header("Production Validator")
     st.markdown("Test prompts for production deployment with consistency, robustness, and performance tests.")
     
@@ -226,7 +238,7 @@ def show_production_validator():
     with col3:
         num_runs = st.number_input("Consistency Runs", min_value=3, max_value=10, value=5)
     
-        if st.button("Run Production Validation", type="primary"):
+    if st.button("Run Production Validation", type="primary"):
         if not prompt_text:
             st.error("Please enter prompt text.")
         elif not st.session_state.llm_client:
@@ -242,10 +254,13 @@ def show_production_validator():
                 )
                 st.session_state.prod_validator.add_test_case(prompt_id, test_case)
                 
-                # Create prompt function
+                # Create prompt function. The validator calls it from worker
+                # threads, which can't read st.session_state, so bind the
+                # client here
+                llm_client = st.session_state.llm_client
                 def run_prompt(input_data: str) -> str:
                     full_prompt = f"{prompt_text}\n\nInput: {input_data}"
-                    response = st.session_state.llm_client.generate(full_prompt)
+                    response = llm_client.generate(full_prompt)
                     return response.content if not response.error else ""
                 
                 # Run validation
@@ -279,6 +294,8 @@ def show_production_validator():
 
 def show_ab_testing():
     """A/B Testing page"""
+    initialize_session_state('ab_tester')
+    
     st.header("A/B Testing Framework")
     st.markdown("Compare different prompt versions and track performance scientifically.")
     
@@ -349,6 +366,8 @@ def show_ab_testing():
 
 def show_progress_tracker():
     """Progress Tracker page"""
+    initialize_session_state('progress_tracker')
+    
     st.header("Progress Tracker")
     st.markdown("Track your learning progress and skill mastery.")
     
@@ -376,6 +395,8 @@ def show_progress_tracker():
 
 def show_llm_playground():
     """LLM Playground page"""
+    initialize_session_state('llm_client')
+    
     st.header("LLM Playground")
     st.markdown("Test prompts with real LLM providers (OpenAI, Anthropic, Ollama).")
     
@@ -384,10 +405,11 @@ def show_llm_playground():
         current_provider = st.session_state.llm_client.get_provider_name()
         st.info(f"Current Provider: **{current_provider.upper()}**")
     else:
-            st.warning("No LLM provider configured. Please set API keys in your environment.")
+        st.warning("No LLM provider configured. Please set API keys in your environment.")
         provider_type = st.selectbox("Select Provider:", ["openai", "anthropic", "ollama"])
         if st.button("Initialize Provider"):
             try:
+                from model_providers import ModelProviderFactory
                 st.session_state.llm_client = ModelProviderFactory.create_provider(provider_type)
                 st.success(f"Provider '{provider_type}' initialized!")
                 st.experimental_rerun()
@@ -411,7 +433,7 @@ def show_llm_playground():
     with col3:
         st.write("")  # Spacer
     
-        if st.button("Generate Response", type="primary"):
+    if st.button("Generate Response", type="primary"):
         if prompt:
             with st.spinner("Generating response..."):
                 response = st.session_state.llm_client.generate(
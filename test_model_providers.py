@@ -0,0 +1,188 @@
+"""
+Test the LLM client helpers
+Run this (or pytest) to check batching, caching and retries without API keys
+"""
+
+import sys
+import os
+import time
+import asyncio
+import tempfile
+sys.path.append('notebooks')
+
+from model_providers import (
+    LLMCache, LLMProvider, LLMResponse, UnifiedLLMClient, AsyncTokenBucket, ProviderHTTPError,
+    _split_packed_response, _backoff_delay, _retry
+)
+
+
+class EchoProvider(LLMProvider):
+    """Offline provider that echoes prompts; packed prompts get a malformed reply"""
+    provider_name = "echo"
+    model = "echo"
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def generate(self, prompt: str, **kwargs) -> LLMResponse:
+        self.calls += 1
+        content = "no markers here" if prompt.count("[[") > 1 else f"echo: {prompt}"
+        return LLMResponse(content=content, model=self.model, provider=self.provider_name)
+    
+    def get_available_models(self):
+        return [self.model]
+
+
+def test_packed_responses():
+    """Test splitting packed [[i]] replies and the per-prompt fallback"""
+    print("🧪 Testing Packed Responses...")
+    
+    answers = _split_packed_response("Sure!\n[[1]] first\n[[2]] second\n", 2)
+    print(f"   Split answers: {answers}")
+    assert answers == ["first", "second"]
+    assert _split_packed_response("[[1]] first", 2) is None
+    assert _split_packed_response("[[1]] a [[2]] b [[3]] c", 2) is None
+    
+    # The echo provider can't answer packed prompts, so each prompt is re-run
+    client = UnifiedLLMClient(provider=EchoProvider(), use_cache=False)
+    responses = client.generate_batch(["a", "b", "c"], batch_size=2)
+    print(f"   Fallback answers: {[r.content for r in responses]}")
+    assert [r.content for r in responses] == ["echo: a", "echo: b", "echo: c"]
+    
+    # generate_batch also works from inside a running event loop (Jupyter)
+    async def inside_loop():
+        return client.generate_batch(["d"])
+    assert [r.content for r in asyncio.run(inside_loop())] == ["echo: d"]
+    
+    print("   ✅ Packed responses working correctly")
+
+
+def test_response_cache():
+    """Test that only temperature-0 calls are cached, keyed on the request parameters"""
+    print("\n🧪 Testing Response Cache...")
+    
+    provider = EchoProvider()
+    client = UnifiedLLMClient(provider=provider)
+    client.generate("hello", temperature=0)
+    client.generate("hello", temperature=0)
+    client.generate("hello", temperature=0, max_tokens=10)
+    client.generate("hello", temperature=0.7)
+    client.generate("hello", temperature=0, no_cache=True)
+    
+    print(f"   Provider calls: {provider.calls}, stats: {client.stats}")
+    assert provider.calls == 4
+    assert client.stats["hits"] == 1
+    assert LLMCache.make_key("a", "hello") != LLMCache.make_key("b", "hello")
+    
+    print("   ✅ Response cache working correctly")
+
+
+def test_retry():
+    """Test backoff bounds and retrying only transient provider errors"""
+    print("\n🧪 Testing Retry...")
+    
+    for attempt in range(8):
+        for _ in range(20):
+            assert 0 <= _backoff_delay(attempt, 0.5, 4) <= min(4, 0.5 * 2 ** attempt)
+    
+    calls = []
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ProviderHTTPError(503, "unavailable")
+        return "done"
+    assert _retry(flaky, base=0, cap=0) == "done"
+    
+    bad_calls = []
+    def bad_request():
+        bad_calls.append(1)
+        raise ProviderHTTPError(400, "bad request")
+    try:
+        _retry(bad_request, base=0, cap=0)
+        raise AssertionError("non-retryable error was swallowed")
+    except ProviderHTTPError:
+        pass
+    
+    print(f"   Retried calls: {len(calls)}, non-retryable calls: {len(bad_calls)}")
+    assert len(calls) == 3
+    assert len(bad_calls) == 1
+    
+    print("   ✅ Retry working correctly")
+
+
+def test_token_bucket():
+    """Test that the token bucket throttles acquires beyond its burst"""
+    print("\n🧪 Testing Token Bucket...")
+    
+    # 50 tokens/s with a burst of 1: five acquires need at least ~80ms
+    bucket = AsyncTokenBucket(rate_per_sec=50, burst=1)
+    async def acquire_all():
+        for _ in range(5):
+            await bucket.acquire()
+    start = time.monotonic()
+    asyncio.run(acquire_all())
+    elapsed = time.monotonic() - start
+    
+    print(f"   Token bucket wait: {elapsed * 1000:.0f}ms")
+    assert elapsed >= 0.07
+    
+    print("   ✅ Token bucket working correctly")
+
+
+def test_cache_checkpoint():
+    """Test reloading an LLMCache checkpoint with a truncated last line"""
+    print("\n🧪 Testing Cache Checkpoint...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "responses.jsonl")
+        cache = LLMCache(persist_path=path)
+        cache.set("one", LLMResponse(content="first", model="m", provider="p"))
+        cache.set("two", LLMResponse(content="second", model="m", provider="p"))
+        cache.close()
+        
+        # Simulate a run interrupted mid-write
+        with open(path, "a") as f:
+            f.write('{"key": "three", "expires_at": ')
+        
+        reloaded = LLMCache(persist_path=path)
+        first = reloaded.get("one")
+        reloaded.close()
+    
+    print(f"   Reloaded entries: {len(reloaded)}")
+    assert len(reloaded) == 2
+    assert first is not None and first.content == "first"
+    
+    print("   ✅ Cache checkpoint working correctly")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 LLM Client Helper Test")
+    print("=" * 40)
+    
+    tests = [
+        test_packed_responses,
+        test_response_cache,
+        test_retry,
+        test_token_bucket,
+        test_cache_checkpoint
+    ]
+    
+    all_passed = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"   ❌ {test.__name__} failed: {e!r}")
+            all_passed = False
+    
+    print("\n" + "=" * 40)
+    if all_passed:
+        print("🎉 All LLM client helpers are working!")
+    else:
+        print("❌ Some LLM client helpers are not working. Check the errors above.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Test the prompt validator's batch scoring
+Run this (or pytest) to check score_batch against score_prompt
+"""
+
+import sys
+sys.path.append('notebooks')
+
+from prompt_validator import PromptValidator
+
+PROMPTS = [
+    "Write something good",
+    "You are a data analyst. Summarize the attached sales report in 5 bullet points "
+    "for executives, in a professional tone, and end with one recommendation.",
+    "Write something good",
+    "hi",
+    "Act as a senior Python reviewer. Review the following function for bugs, naming and "
+    "performance. Return a numbered list of issues, each with a one-line fix. Keep it under "
+    "200 words. Example: 1. Off-by-one in loop bound - use range(n).",
+    "You are a professional copywriter specializing in email marketing. For example, a subject "
+    "line like \"Your first step\". Write a 150-word welcome email for new subscribers to a "
+    "productivity newsletter.\nTarget audience: busy professionals who want to optimize their "
+    "workflow.\nFormat:\n1. Greeting\n2. Three bullet points with specific benefits\n"
+    "3. A clear call-to-action to download our free productivity guide\nTone should be friendly "
+    "but professional. Context: the newsletter is weekly, free, and focused on time management."
+]
+
+
+def test_score_batch():
+    """Test that batch scoring matches scoring prompts one at a time"""
+    print("🧪 Testing Batch Scoring...")
+    
+    validator = PromptValidator()
+    batch = validator.score_batch(PROMPTS)
+    single = [validator.score_prompt(p) for p in PROMPTS]
+    
+    print(f"   Batch scores: {[round(r['overall_score'], 2) for r in batch]}")
+    assert len(batch) == len(PROMPTS)
+    for b, s in zip(batch, single):
+        assert abs(b['overall_score'] - s['overall_score']) < 1e-9
+    
+    # Duplicates get equal but separate results
+    assert batch[0] == batch[2] and batch[0] is not batch[2]
+    
+    print("   ✅ Batch scoring working correctly")
+
+
+def test_batch_grades():
+    """Test that the column-wise weighted scores and grades match the per-prompt ones"""
+    print("\n🧪 Testing Batch Grades...")
+    
+    validator = PromptValidator()
+    batch = validator.score_batch(PROMPTS)
+    single = [validator.score_prompt(p) for p in PROMPTS]
+    
+    print(f"   Batch grades: {[r['grade'].split()[0] for r in batch]}")
+    for b, s in zip(batch, single):
+        assert b['grade'] == s['grade']
+        assert b['weighted_scores'].keys() == s['weighted_scores'].keys()
+        for key, value in s['weighted_scores'].items():
+            assert abs(b['weighted_scores'][key] - value) < 1e-9
+    
+    print("   ✅ Batch grades working correctly")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Prompt Validator Batch Test")
+    print("=" * 40)
+    
+    tests = [
+        test_score_batch,
+        test_batch_grades
+    ]
+    
+    all_passed = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"   ❌ {test.__name__} failed: {e!r}")
+            all_passed = False
+    
+    print("\n" + "=" * 40)
+    if all_passed:
+        print("🎉 Batch scoring is working!")
+    else:
+        print("❌ Batch scoring is not working. Check the errors above.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Test the growth automation tools
+Run this (or pytest) to check the automation log and GitHub metric helpers offline
+"""
+
+import sys
+import json
+import tempfile
+from pathlib import Path
+sys.path.append('tools')
+
+import run_growth_strategies
+from metrics_tracker import _last_page_count, _search_total
+
+
+def test_automation_log():
+    """Test reading the log tail, compacting a large log and migrating the old JSON log"""
+    print("🧪 Testing Automation Log...")
+    
+    keep, max_bytes = run_growth_strategies.AUTOMATION_LOG_KEEP, run_growth_strategies.AUTOMATION_LOG_MAX_BYTES
+    run_growth_strategies.AUTOMATION_LOG_KEEP, run_growth_strategies.AUTOMATION_LOG_MAX_BYTES = 5, 200
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "automation_log.jsonl"
+            for run in range(40):
+                run_growth_strategies.append_log({"run": run}, path)
+            
+            lines = path.read_text().splitlines()
+            tail = run_growth_strategies.tail_log(path, 3, block_size=16)
+            
+            legacy_path = Path(tmp) / "automation_log.json"
+            legacy_path.write_text(json.dumps([{"run": "old"}]))
+            run_growth_strategies.migrate_legacy_log(legacy_path, path)
+            migrated = path.read_text().splitlines()
+            legacy_removed = not legacy_path.exists()
+    finally:
+        run_growth_strategies.AUTOMATION_LOG_KEEP, run_growth_strategies.AUTOMATION_LOG_MAX_BYTES = keep, max_bytes
+    
+    print(f"   Lines kept: {len(lines)}, tail: {tail}")
+    assert len(lines) < 40
+    assert tail == [{"run": 37}, {"run": 38}, {"run": 39}]
+    assert json.loads(migrated[0]) == {"run": "old"} and migrated[1:] == lines
+    assert legacy_removed
+    
+    print("   ✅ Automation log working correctly")
+
+
+def test_search_total():
+    """Test counting closed issues and PRs from the search API's total_count"""
+    print("\n🧪 Testing Search Totals...")
+    
+    total = _search_total({"total_count": 40, "items": [{}]}, {})
+    
+    print(f"   Search total: {total}")
+    assert total == 40
+    assert _search_total({}, {}) == 0
+    
+    print("   ✅ Search totals working correctly")
+
+
+def test_last_page_count():
+    """Test counting contributors and commits from the Link header's last page"""
+    print("\n🧪 Testing Link Header Counts...")
+    
+    link = ('<https://api.github.com/repositories/1/contributors?per_page=1&page=2>; rel="next", '
+            '<https://api.github.com/repositories/1/contributors?per_page=1&page=37>; rel="last"')
+    paged = _last_page_count([{}], {"Link": link})
+    single_page = _last_page_count([{}], {})
+    
+    print(f"   Paged: {paged}, single page: {single_page}")
+    assert paged == 37
+    assert single_page == 1
+    assert _last_page_count([], {}) == 0
+    
+    print("   ✅ Link header counts working correctly")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Growth Tools Test")
+    print("=" * 40)
+    
+    tests = [
+        test_automation_log,
+        test_search_total,
+        test_last_page_count
+    ]
+    
+    all_passed = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"   ❌ {test.__name__} failed: {e!r}")
+            all_passed = False
+    
+    print("\n" + "=" * 40)
+    if all_passed:
+        print("🎉 All growth tools are working!")
+    else:
+        print("❌ Some growth tools are not working. Check the errors above.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
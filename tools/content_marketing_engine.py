@@ -5,22 +5,189 @@ Automates blog post generation, case study collection, and content scheduling
 
 import json
 import os
-from datetime import datetime, timedelta
+import re
+import time
+import asyncio
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+from dataclasses import dataclass, fields
 import sys
 
-# Add parent directory to path for imports
+# Add parent directory to path for the notebooks package imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-try:
-    from notebooks.model_providers import UnifiedLLMClient, ModelProviderFactory
-except ImportError:
-    print("Warning: Model providers not available. Install required dependencies.")
+from notebooks.common import DATACLASS_SLOTS, ensure_dir, write_json
+
+if TYPE_CHECKING:
+    from notebooks.model_providers import UnifiedLLMClient, LLMCache, LLMResponse
+
+# Generated text is reused for identical requests (e.g. a topic that comes
+# round again in schedule_weekly_posts) via an on-disk JSONL cache
+LLM_CACHE_PATH = Path(__file__).parent.parent / "content" / ".llm_cache" / "responses.jsonl"
+LLM_CACHE_TTL = 30 * 24 * 3600  # 30 days
+# Maximum concurrent LLM generations when scheduling posts
+CONTENT_CONCURRENCY = 8
+_response_cache = None
+# Characters not allowed in generated filenames (\w is isalnum() plus "_")
+_SLUG_INVALID_RE = re.compile(r"[^\w-]")
+_NAME_INVALID_RE = re.compile(r"\W")
+
+
+def _bullet_list(items: List[str]) -> str:
+    """Format items as a "- " markdown list, one per line"""
+    return "- " + "\n- ".join(items) if items else ""
+
+
+def _get_response_cache() -> "LLMCache":
+    """Shared response cache, loaded from LLM_CACHE_PATH on first use"""
+    global _response_cache
+    if _response_cache is None:
+        from notebooks.model_providers import LLMCache
+        ensure_dir(LLM_CACHE_PATH.parent)
+        _response_cache = LLMCache(ttl=LLM_CACHE_TTL, persist_path=str(LLM_CACHE_PATH))
+    return _response_cache
+
+
+def _response_cache_key(llm_client: "UnifiedLLMClient", prompt: str, system: str, max_tokens: int) -> str:
+    """Cache key over the provider, model, system prompt, max_tokens and prompt"""
+    namespace = json.dumps({
+        "provider": llm_client.get_provider_name(),
+        "model": getattr(llm_client.provider, "model", None),
+        "system": system,
+        "max_tokens": max_tokens
+    }, sort_keys=True)
+    from notebooks.model_providers import LLMCache
+    return LLMCache.make_key(namespace, prompt)
+
+
+def _cached_generate(llm_client: "UnifiedLLMClient", prompt: str, system: str,
+                     max_tokens: int, use_cache: bool = True):
+    """Generate with llm_client, returning a stored response for a repeated request"""
+    if not use_cache:
+        return llm_client.generate(prompt, system=system, max_tokens=max_tokens)
+    
+    cache = _get_response_cache()
+    key = _response_cache_key(llm_client, prompt, system, max_tokens)
+    response = cache.get(key)
+    if response is None:
+        response = llm_client.generate(prompt, system=system, max_tokens=max_tokens)
+        if not response.error:
+            cache.set(key, response)
+    return response
+
+
+async def _astream_generate(llm_client: "UnifiedLLMClient", prompt: str, system: str,
+                            max_tokens: int) -> "LLMResponse":
+    """
+    Collect a streamed response into an LLMResponse. Chunks from concurrent
+    streams interleave on the event loop instead of each request waiting on
+    one long read for the whole body. The OpenAI, Anthropic and Ollama
+    providers all stream natively.
+    """
+    start = time.perf_counter()
+    chunks = []
+    try:
+        async for chunk in llm_client.agenerate_stream(prompt, system=system, max_tokens=max_tokens):
+            chunks.append(chunk)
+        error = None
+    except Exception as e:
+        error = str(e)
+    from notebooks.model_providers import LLMResponse
+    return LLMResponse(
+        content="".join(chunks),
+        model=getattr(llm_client.provider, "model", None),
+        provider=llm_client.get_provider_name(),
+        latency_ms=(time.perf_counter() - start) * 1000,
+        error=error
+    )
+
+
+async def _acached_generate(llm_client: "UnifiedLLMClient", prompt: str, system: str,
+                            max_tokens: int, use_cache: bool = True, stream: bool = False):
+    """Async variant of _cached_generate(); stream=True collects a streamed response"""
+    generate = _astream_generate if stream else _agenerate
+    if not use_cache:
+        return await generate(llm_client, prompt, system, max_tokens)
+    
+    cache = _get_response_cache()
+    key = _response_cache_key(llm_client, prompt, system, max_tokens)
+    response = cache.get(key)
+    if response is None:
+        response = await generate(llm_client, prompt, system, max_tokens)
+        if not response.error:
+            cache.set(key, response)
+    return response
+
+
+async def _agenerate(llm_client: "UnifiedLLMClient", prompt: str, system: str,
+                     max_tokens: int) -> "LLMResponse":
+    return await llm_client.agenerate(prompt, system=system, max_tokens=max_tokens)
+
+
+# Static instructions are sent as the system prompt and the per-item details
+# as the user prompt, so repeated calls share a prefix the provider can cache
+BLOG_TITLE_PREFIX = """Generate a compelling, SEO-friendly blog post title about the topic below
+for the target audience below.
 
+Requirements:
+- 50-60 characters
+- Include power words
+- Focus on value/outcome
+- Include "prompt engineering" naturally
 
-@dataclass
+Return only the title, no quotes."""
+
+BLOG_TITLES_PREFIX = """Generate a compelling, SEO-friendly blog post title for each numbered topic
+below, for the target audience below.
+
+Requirements:
+- 50-60 characters
+- Include power words
+- Focus on value/outcome
+- Include "prompt engineering" naturally
+
+Return only a JSON array of title strings, one per topic, in the same order."""
+
+BLOG_CONTENT_PREFIX = """Write a comprehensive 1500-2000 word blog post with the title, topic and target audience below.
+
+Structure:
+1. Engaging hook (problem-focused)
+2. Clear explanation of the concept
+3. Step-by-step guide with examples
+4. Real-world use cases
+5. Common mistakes to avoid
+6. Actionable takeaways
+
+Tone: Educational, practical, and accessible
+Include specific prompt examples throughout."""
+
+CASE_STUDY_PREFIX = """Create a compelling case study based on the student information below.
+
+Structure:
+1. Headline with specific outcome
+2. Challenge section
+3. Solution approach
+4. Key prompts that made the difference
+5. Results and metrics
+6. Takeaways for readers
+
+Tone: Inspiring, specific, and actionable"""
+
+RELEASE_PREFIX = """Create an engaging tool release announcement for the tool below.
+
+Structure:
+1. Hook: Problem this tool solves
+2. What it is and why it matters
+3. Key features walkthrough
+4. Real use cases
+5. How to get started (free)
+6. Call to action
+
+Tone: Exciting, helpful, and community-focused"""
+
+
+@dataclass(**DATACLASS_SLOTS)
 class BlogPost:
     """Blog post structure"""
     title: str
@@ -37,9 +204,16 @@ class BlogPost:
             self.tags = []
         if self.seo_keywords is None:
             self.seo_keywords = []
+    
+    def _to_dict(self) -> Dict:
+        """Shallow dict of the fields, without asdict()'s recursive copy"""
+        return {name: getattr(self, name) for name in _BLOG_POST_FIELDS}
+
 
+_BLOG_POST_FIELDS = tuple(f.name for f in fields(BlogPost))
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class CaseStudy:
     """Case study structure"""
     student_name: str
@@ -52,22 +226,33 @@ class CaseStudy:
     publish_date: str
     status: str  # draft, scheduled, published
     content: Optional[str] = None
+    
+    def _to_dict(self) -> Dict:
+        """Shallow dict of the fields, without asdict()'s recursive copy"""
+        return {name: getattr(self, name) for name in _CASE_STUDY_FIELDS}
+
+
+_CASE_STUDY_FIELDS = tuple(f.name for f in fields(CaseStudy))
 
 
 class BlogPostGenerator:
-    """Generate weekly blog posts about prompt engineering"""
+    """
+    Generate weekly blog posts about prompt engineering.
     
-    def __init__(self, llm_client: Optional[UnifiedLLMClient] = None):
+    Pass one long-lived llm_client and reuse it: its provider holds the
+    pooled HTTP connections, so a client built per call pays a fresh
+    connection (and TLS handshake) for every request.
+    """
+    
+    def __init__(self, llm_client: Optional["UnifiedLLMClient"] = None, use_cache: bool = True):
         self.llm_client = llm_client
+        self.use_cache = use_cache
         self.blog_dir = Path(__file__).parent.parent / "content" / "blog"
-        self.blog_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(self.blog_dir)
         
     def generate_blog_post(self, topic: str, target_audience: str, 
                           publish_date: Optional[str] = None) -> BlogPost:
         """Generate a blog post on a given topic"""
-        if publish_date is None:
-            publish_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
         if self.llm_client:
             title = self._generate_title(topic, target_audience)
             content = self._generate_content(title, topic, target_audience)
@@ -75,6 +260,20 @@ class BlogPostGenerator:
             title = f"Mastering {topic}: A Guide for {target_audience}"
             content = None
         
+        return self._create_blog_post(topic, target_audience, publish_date, title, content)
+    
+    async def agenerate_blog_post(self, topic: str, target_audience: str,
+                                  publish_date: Optional[str] = None) -> BlogPost:
+        """Async variant of generate_blog_post()"""
+        title, content = await self._agenerate_title_and_content(topic, target_audience)
+        return self._create_blog_post(topic, target_audience, publish_date, title, content)
+    
+    def _create_blog_post(self, topic: str, target_audience: str, publish_date: Optional[str],
+                          title: str, content: Optional[str]) -> BlogPost:
+        """Build and save a draft post from generated title and content"""
+        if publish_date is None:
+            publish_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+        
         blog_post = BlogPost(
             title=title,
             topic=topic,
@@ -89,45 +288,83 @@ class BlogPostGenerator:
         self._save_blog_post(blog_post)
         return blog_post
     
+    @staticmethod
+    def _title_prompt(topic: str, audience: str) -> str:
+        return f"""Topic: "{topic}"
+Target audience: {audience}"""
+    
+    @staticmethod
+    def _content_prompt(title: str, topic: str, audience: str) -> str:
+        return f"""Title: "{title}"
+
+Topic: {topic}
+Target Audience: {audience}"""
+    
     def _generate_title(self, topic: str, audience: str) -> str:
         """Generate SEO-optimized blog post title"""
-        prompt = f"""Generate a compelling, SEO-friendly blog post title about "{topic}" 
-for the target audience: {audience}.
-
-Requirements:
-- 50-60 characters
-- Include power words
-- Focus on value/outcome
-- Include "prompt engineering" naturally
-
-Return only the title, no quotes."""
-        
         if self.llm_client:
-            return self.llm_client.generate(prompt, max_tokens=100).strip()
+            response = _cached_generate(self.llm_client, self._title_prompt(topic, audience),
+                                        BLOG_TITLE_PREFIX, 100, self.use_cache)
+            if not response.error:
+                return response.content.strip()
         return f"How to Master {topic} with Prompt Engineering"
     
     def _generate_content(self, title: str, topic: str, audience: str) -> str:
         """Generate full blog post content"""
-        prompt = f"""Write a comprehensive 1500-2000 word blog post with the title: "{title}"
-
-Topic: {topic}
-Target Audience: {audience}
-
-Structure:
-1. Engaging hook (problem-focused)
-2. Clear explanation of the concept
-3. Step-by-step guide with examples
-4. Real-world use cases
-5. Common mistakes to avoid
-6. Actionable takeaways
-
-Tone: Educational, practical, and accessible
-Include specific prompt examples throughout."""
-        
         if self.llm_client:
-            return self.llm_client.generate(prompt, max_tokens=2000)
+            response = _cached_generate(self.llm_client, self._content_prompt(title, topic, audience),
+                                        BLOG_CONTENT_PREFIX, 2000, self.use_cache)
+            if not response.error:
+                return response.content
         return f"# {title}\n\n[Content for {topic} - Generated content would appear here]"
     
+    async def _agenerate_titles(self, topics: List[str], audience: str) -> Optional[List[str]]:
+        """
+        Generate titles for several topics in one call. Returns None if the
+        response is not a JSON array with one string per topic.
+        """
+        numbered = "\n".join(f"{i}. {topic}" for i, topic in enumerate(topics, 1))
+        prompt = f"""Topics:
+{numbered}
+
+Target audience: {audience}"""
+        response = await _acached_generate(self.llm_client, prompt, BLOG_TITLES_PREFIX,
+                                           60 * len(topics) + 50, self.use_cache)
+        if response.error:
+            return None
+        
+        # Tolerate prose or a code fence around the array
+        text = response.content
+        start, end = text.find("["), text.rfind("]")
+        try:
+            titles = json.loads(text[start:end + 1]) if 0 <= start < end else None
+        except ValueError:
+            return None
+        if (not isinstance(titles, list) or len(titles) != len(topics)
+                or not all(isinstance(t, str) and t.strip() for t in titles)):
+            return None
+        return [t.strip() for t in titles]
+    
+    async def _agenerate_title_and_content(self, topic: str, audience: str,
+                                           title: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        """Generate a title (unless given) and then the content written to it"""
+        if not self.llm_client:
+            return f"Mastering {topic}: A Guide for {audience}", None
+        
+        if title is None:
+            title = f"How to Master {topic} with Prompt Engineering"
+            response = await _acached_generate(self.llm_client, self._title_prompt(topic, audience),
+                                               BLOG_TITLE_PREFIX, 100, self.use_cache)
+            if not response.error:
+                title = response.content.strip()
+        
+        content = f"# {title}\n\n[Content for {topic} - Generated content would appear here]"
+        response = await _acached_generate(self.llm_client, self._content_prompt(title, topic, audience),
+                                           BLOG_CONTENT_PREFIX, 2000, self.use_cache, stream=True)
+        if not response.error:
+            content = response.content
+        return title, content
+    
     def _generate_tags(self, topic: str) -> List[str]:
         """Generate relevant tags"""
         base_tags = ["prompt engineering", "AI", "LLM", "productivity"]
@@ -146,14 +383,23 @@ Include specific prompt examples throughout."""
     def _save_blog_post(self, blog_post: BlogPost):
         """Save blog post to file"""
         filename = blog_post.title.lower().replace(" ", "_").replace(":", "")
-        filename = "".join(c for c in filename if c.isalnum() or c in ("_", "-"))
+        filename = _SLUG_INVALID_RE.sub("", filename)
         filepath = self.blog_dir / f"{blog_post.publish_date}_{filename}.json"
         
-        with open(filepath, "w") as f:
-            json.dump(asdict(blog_post), f, indent=2)
+        write_json(filepath, blog_post._to_dict())
     
     def schedule_weekly_posts(self, weeks: int = 4, topics: List[str] = None):
-        """Schedule weekly blog posts for the next N weeks"""
+        """Schedule weekly blog posts for the next N weeks (see run_sync)"""
+        from notebooks.model_providers import run_sync
+        return run_sync(self.schedule_weekly_posts_async(weeks, topics))
+    
+    async def schedule_weekly_posts_async(self, weeks: int = 4, topics: List[str] = None,
+                                          max_concurrency: int = CONTENT_CONCURRENCY):
+        """
+        Async variant of schedule_weekly_posts(). Posts are generated
+        concurrently (at most max_concurrency at a time), and a topic that
+        repeats across weeks is generated once and reused with a new date.
+        """
         if topics is None:
             topics = [
                 "Context Injection Techniques",
@@ -165,18 +411,35 @@ Include specific prompt examples throughout."""
                 "Prompt Versioning",
                 "A/B Testing Prompts"
             ]
+        target_audience = "developers and content creators"
+        week_topics = [topics[i % len(topics)] for i in range(weeks)]
+        
+        # Topics cycle once weeks > len(topics); generate each distinct one once
+        unique_topics = list(dict.fromkeys(week_topics))
+        
+        # All titles in one call (falling back to a call per topic if the
+        # batch response can't be parsed); bodies are too long to batch
+        titles = None
+        if self.llm_client and len(unique_topics) > 1:
+            titles = await self._agenerate_titles(unique_topics, target_audience)
+        if titles is None:
+            titles = [None] * len(unique_topics)
         
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def generate(topic: str, title: Optional[str]):
+            async with semaphore:
+                return await self._agenerate_title_and_content(topic, target_audience, title)
+        
+        generated = dict(zip(unique_topics, await asyncio.gather(*map(generate, unique_topics, titles))))
+        
+        # One anchor date for the whole schedule; date.isoformat() gives YYYY-MM-DD
+        today = date.today()
         scheduled = []
-        for i in range(weeks):
-            publish_date = (datetime.now() + timedelta(weeks=i+1)).strftime("%Y-%m-%d")
-            topic = topics[i % len(topics)]
-            
-            blog_post = self.generate_blog_post(
-                topic=topic,
-                target_audience="developers and content creators",
-                publish_date=publish_date
-            )
-            scheduled.append(blog_post)
+        for i, topic in enumerate(week_topics):
+            publish_date = (today + timedelta(weeks=i+1)).isoformat()
+            title, content = generated[topic]
+            scheduled.append(self._create_blog_post(topic, target_audience, publish_date, title, content))
         
         return scheduled
 
@@ -186,7 +449,7 @@ class CaseStudyCollector:
     
     def __init__(self):
         self.case_studies_dir = Path(__file__).parent.parent / "content" / "case_studies"
-        self.case_studies_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(self.case_studies_dir)
     
     def create_case_study(self, student_name: str, role: str, 
                          before_situation: str, after_situation: str,
@@ -214,14 +477,15 @@ class CaseStudyCollector:
     def _extract_outcome(self, after_situation: str) -> str:
         """Extract the key outcome from after situation"""
         # Simple extraction - could be enhanced with LLM
-        return after_situation[:200] + "..."
+        if len(after_situation) <= 200:
+            return after_situation
+        return f"{after_situation[:200]}..."
     
     def generate_case_study_content(self, case_study: CaseStudy, 
-                                   llm_client: Optional[UnifiedLLMClient] = None) -> str:
+                                   llm_client: Optional["UnifiedLLMClient"] = None,
+                                   use_cache: bool = True) -> str:
         """Generate formatted case study content"""
-        prompt = f"""Create a compelling case study based on this information:
-
-Student: {case_study.student_name}
+        prompt = f"""Student: {case_study.student_name}
 Role: {case_study.role}
 
 Before: {case_study.before_situation}
@@ -231,20 +495,11 @@ After: {case_study.after_situation}
 Results: {case_study.results_metrics}
 
 Key Prompts Used:
-{chr(10).join(f"- {p}" for p in case_study.key_prompts_used)}
-
-Structure:
-1. Headline with specific outcome
-2. Challenge section
-3. Solution approach
-4. Key prompts that made the difference
-5. Results and metrics
-6. Takeaways for readers
-
-Tone: Inspiring, specific, and actionable"""
+{_bullet_list(case_study.key_prompts_used)}"""
         
-        if llm_client:
-            content = llm_client.generate(prompt, max_tokens=1500)
+        response = _cached_generate(llm_client, prompt, CASE_STUDY_PREFIX, 1500, use_cache) if llm_client else None
+        if response is not None and not response.error:
+            content = response.content
         else:
             content = f"# Case Study: {case_study.student_name}\n\n[Case study content would be generated here]"
         
@@ -255,11 +510,10 @@ Tone: Inspiring, specific, and actionable"""
     def _save_case_study(self, case_study: CaseStudy):
         """Save case study to file"""
         filename = case_study.student_name.lower().replace(" ", "_")
-        filename = "".join(c for c in filename if c.isalnum() or c == "_")
+        filename = _NAME_INVALID_RE.sub("", filename)
         filepath = self.case_studies_dir / f"{case_study.publish_date}_{filename}.json"
         
-        with open(filepath, "w") as f:
-            json.dump(asdict(case_study), f, indent=2)
+        write_json(filepath, case_study._to_dict())
 
 
 class ToolReleaseManager:
@@ -267,7 +521,7 @@ class ToolReleaseManager:
     
     def __init__(self):
         self.releases_dir = Path(__file__).parent.parent / "content" / "releases"
-        self.releases_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(self.releases_dir)
     
     def create_release_announcement(self, tool_name: str, description: str,
                                    features: List[str], use_cases: List[str],
@@ -287,37 +541,27 @@ class ToolReleaseManager:
         }
         
         filepath = self.releases_dir / f"{release_date}_{tool_name.lower().replace(' ', '_')}.json"
-        with open(filepath, "w") as f:
-            json.dump(release, f, indent=2)
+        write_json(filepath, release)
         
         return release
     
     def generate_release_content(self, release: dict, 
-                                llm_client: Optional[UnifiedLLMClient] = None) -> str:
+                                llm_client: Optional["UnifiedLLMClient"] = None,
+                                use_cache: bool = True) -> str:
         """Generate release announcement content"""
-        prompt = f"""Create an engaging tool release announcement:
-
-Tool: {release['tool_name']}
+        prompt = f"""Tool: {release['tool_name']}
 Description: {release['description']}
 
 Features:
-{chr(10).join(f"- {f}" for f in release['features'])}
+{_bullet_list(release['features'])}
 
 Use Cases:
-{chr(10).join(f"- {uc}" for uc in release['use_cases'])}
-
-Structure:
-1. Hook: Problem this tool solves
-2. What it is and why it matters
-3. Key features walkthrough
-4. Real use cases
-5. How to get started (free)
-6. Call to action
-
-Tone: Exciting, helpful, and community-focused"""
+{_bullet_list(release['use_cases'])}"""
         
         if llm_client:
-            return llm_client.generate(prompt, max_tokens=1200)
+            response = _cached_generate(llm_client, prompt, RELEASE_PREFIX, 1200, use_cache)
+            if not response.error:
+                return response.content
         return f"# Introducing {release['tool_name']}\n\n[Release announcement would be generated here]"
 
 
@@ -326,7 +570,7 @@ class WebinarScheduler:
     
     def __init__(self):
         self.webinars_dir = Path(__file__).parent.parent / "content" / "webinars"
-        self.webinars_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(self.webinars_dir)
     
     def schedule_webinar(self, topic: str, date: str, duration: int = 60,
                         description: str = None, registration_url: str = None):
@@ -342,26 +586,22 @@ class WebinarScheduler:
         }
         
         # Clean filename
-        safe_topic = "".join(c if c.isalnum() or c in ("_", "-") else "_" for c in topic.lower())
-        safe_topic = safe_topic.replace(" ", "_")
+        safe_topic = _SLUG_INVALID_RE.sub("_", topic.lower())
         filepath = self.webinars_dir / f"{date}_{safe_topic}.json"
         
-        # Ensure directory exists
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, "w") as f:
-            json.dump(webinar, f, indent=2)
+        write_json(filepath, webinar)
         
         return webinar
     
     def schedule_series(self, topics: List[str], start_date: str, 
                        frequency_weeks: int = 2):
         """Schedule a webinar series"""
-        start = datetime.strptime(start_date, "%Y-%m-%d")
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        step = timedelta(weeks=frequency_weeks)
         scheduled = []
         
         for i, topic in enumerate(topics):
-            webinar_date = (start + timedelta(weeks=i * frequency_weeks)).strftime("%Y-%m-%d")
+            webinar_date = (start + i * step).isoformat()
             webinar = self.schedule_webinar(
                 topic=topic,
                 date=webinar_date,
@@ -5,17 +5,149 @@ Tracks website traffic, repository stars/forks, and course completion rates
 
 import json
 import os
+import re
 import sys
+import time
+import asyncio
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import date
 
+try:
+    import aiohttp  # Optional, fetches the GitHub endpoints concurrently
+except ImportError:
+    aiohttp = None
 
-@dataclass
-class TrafficMetrics:
+# Add parent directory to path for the shared notebooks.common helpers
+sys.path.append(str(Path(__file__).parent.parent))
+
+from notebooks.common import DATACLASS_SLOTS, ensure_dir, read_json, write_json
+
+CONTENT_DIR = Path(__file__).parent.parent / "content"
+METRICS_DIR = CONTENT_DIR / "metrics"
+PROGRESS_FILE = CONTENT_DIR / "student_progress.json"
+
+# Metrics files are read back by the reports, not by people, so they are
+# written compact; set METRICS_PRETTY_JSON=1 to indent them for debugging
+PRETTY_JSON = os.getenv("METRICS_PRETTY_JSON", "").lower() in ("1", "true", "yes")
+
+# Per-request timeout for GitHub API calls, in seconds
+GITHUB_TIMEOUT = 10
+
+# Bounded retry of transient GitHub errors, shared by the requests session
+# and the aiohttp path: up to GITHUB_RETRIES retries on connection errors
+# or these statuses, sleeping GITHUB_RETRY_BACKOFF * 2**n seconds between them
+GITHUB_RETRIES = 3
+GITHUB_RETRY_BACKOFF = 0.3
+GITHUB_RETRY_STATUSES = (502, 503, 504)
+
+# GitHub quotas per rate-limit resource: (requests per hour, burst) when
+# authenticated and when not. GraphQL needs a token, so it has no
+# unauthenticated quota.
+GITHUB_RATE_LIMITS = {
+    "core": ((5000, 100), (60, 10)),
+    "search": ((30 * 60, 30), (10 * 60, 10)),
+    "graphql": ((5000, 100), (1, 1))
+}
+
+
+class GitHubRateLimiter:
+    """
+    Client-side token bucket for one GitHub rate-limit resource, using the
+    same reservation scheme as model_providers.AsyncTokenBucket: acquire()
+    takes a token immediately (the balance may go negative) and waits until
+    it is covered. update_from_headers() lowers the balance to the server's
+    X-RateLimit-Remaining and, once that reaches 0, holds every request
+    until X-RateLimit-Reset instead of letting it fail with a 403.
+    """
+    
+    def __init__(self, requests_per_hour: float, burst: float):
+        self.rate_per_sec = requests_per_hour / 3600.0
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0  # Unix time of the server-side reset
+    
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens and return how long to wait before sending"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_sec)
+        self._updated = now
+        self._tokens -= tokens
+        delay = -self._tokens / self.rate_per_sec if self._tokens < 0 else 0.0
+        return max(delay, self._blocked_until - time.time())
+    
+    def acquire(self, tokens: float = 1):
+        """Take tokens, sleeping until the bucket can cover them"""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def aacquire(self, tokens: float = 1):
+        """Async variant of acquire()"""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def update_from_headers(self, headers):
+        """Sync the balance with GitHub's X-RateLimit-* response headers"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        self._tokens = min(self._tokens, float(remaining))
+        reset = headers.get("X-RateLimit-Reset")
+        if int(remaining) == 0 and reset:
+            self._blocked_until = float(reset)
+
+
+# Course levels reported in CourseMetrics.progress_by_level
+COURSE_LEVELS = ("foundations", "engineering", "professional")
+
+# How long (seconds) a section of today's daily report is reused before it
+# is fetched again, and how long a generated weekly summary is reused
+REPORT_TTL_SECONDS = {"traffic": 3600, "repository": 1800, "course": 300}
+WEEKLY_SUMMARY_TTL_SECONDS = 3600
+
+# Every repository metric in one GraphQL request (GraphQL needs a token).
+# REST's watchers_count is the star count and its open_issues_count includes
+# open PRs, so those are derived the same way below. GraphQL has no
+# contributor count; mentionableUsers is the closest total it exposes.
+GITHUB_METRICS_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp!) {
+  repository(owner: $owner, name: $name) {
+    stargazerCount
+    forkCount
+    openIssues: issues(states: OPEN) { totalCount }
+    closedIssues: issues(states: CLOSED) { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    pullRequests { totalCount }
+    mentionableUsers { totalCount }
+    defaultBranchRef {
+      target { ... on Commit { history(since: $since) { totalCount } } }
+    }
+  }
+}
+"""
+
+
+class _MetricsRecord:
+    """Shared serialization for the metrics dataclasses"""
+    __slots__ = ()
+    
+    def _to_dict(self) -> Dict:
+        """Shallow dict of the fields, without asdict()'s recursive copy"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+@dataclass(**DATACLASS_SLOTS)
+class TrafficMetrics(_MetricsRecord):
     """Website traffic metrics"""
     date: str
     page_views: int
@@ -27,8 +159,8 @@ class TrafficMetrics:
     traffic_sources: Dict[str, int]
 
 
-@dataclass
-class RepositoryMetrics:
+@dataclass(**DATACLASS_SLOTS)
+class RepositoryMetrics(_MetricsRecord):
     """GitHub repository metrics"""
     date: str
     stars: int
@@ -41,8 +173,8 @@ class RepositoryMetrics:
     commits_last_week: int
 
 
-@dataclass
-class CourseMetrics:
+@dataclass(**DATACLASS_SLOTS)
+class CourseMetrics(_MetricsRecord):
     """Course completion metrics"""
     date: str
     total_students: int
@@ -54,6 +186,24 @@ class CourseMetrics:
     students_by_tool_usage: Dict[str, int]
 
 
+# Page number of the rel="last" link in a paginated response's Link header
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)>; rel="last"')
+
+
+def _search_total(body: Dict, headers) -> int:
+    """Total match count from a GitHub search API response"""
+    return body.get("total_count", 0)
+
+
+def _last_page_count(body: List, headers) -> int:
+    """
+    Item count of a list endpoint requested with per_page=1: the last page
+    number from the Link header, or the page length if it's the only page
+    """
+    match = _LAST_PAGE_RE.search(headers.get("Link", ""))
+    return int(match.group(1)) if match else len(body)
+
+
 class GoogleAnalyticsTracker:
     """Track website traffic using Google Analytics API"""
     
@@ -61,8 +211,8 @@ class GoogleAnalyticsTracker:
                  ga_api_key: Optional[str] = None):
         self.ga_property_id = ga_property_id or os.getenv("GOOGLE_ANALYTICS_PROPERTY_ID")
         self.ga_api_key = ga_api_key or os.getenv("GOOGLE_ANALYTICS_API_KEY")
-        self.metrics_dir = Path(__file__).parent.parent / "content" / "metrics"
-        self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        self.metrics_dir = METRICS_DIR
+        ensure_dir(self.metrics_dir)
     
     def fetch_traffic_metrics(self, start_date: str = None, 
                               end_date: str = None) -> TrafficMetrics:
@@ -131,8 +281,7 @@ class GoogleAnalyticsTracker:
         filename = f"{metrics.date}_{metric_type}.json"
         filepath = self.metrics_dir / filename
         
-        with open(filepath, "w") as f:
-            json.dump(asdict(metrics), f, indent=2)
+        write_json(filepath, metrics._to_dict(), indent=PRETTY_JSON)
 
 
 class GitHubMetricsTracker:
@@ -144,14 +293,49 @@ class GitHubMetricsTracker:
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.github_token = github_token or os.getenv("GITHUB_TOKEN")
-        self.metrics_dir = Path(__file__).parent.parent / "content" / "metrics"
-        self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        self.metrics_dir = METRICS_DIR
+        ensure_dir(self.metrics_dir)
         self.api_base = "https://api.github.com"
+        
+        # Persistent session so the sequential (no aiohttp) path reuses one
+        # keep-alive connection instead of a new TLS handshake per request
+        self.session = requests.Session()
+        self.session.headers.update(self._auth_headers())
+        adapter = HTTPAdapter(
+            pool_connections=2, pool_maxsize=10,
+            max_retries=Retry(total=GITHUB_RETRIES, backoff_factor=GITHUB_RETRY_BACKOFF,
+                              status_forcelist=GITHUB_RETRY_STATUSES)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # One bucket per GitHub rate-limit resource (see GITHUB_RATE_LIMITS)
+        self.rate_limiters = {
+            resource: GitHubRateLimiter(*limits[0 if self.github_token else 1])
+            for resource, limits in GITHUB_RATE_LIMITS.items()
+        }
+        
+        # {request key: [etag, body]} from earlier runs. Sending the ETag back
+        # lets GitHub answer 304, which doesn't count against the rate limit.
+        self._etag_cache_path = self.metrics_dir / ".etag_cache.json"
+        self._etag_cache = None
+        self._etag_cache_dirty = False
     
     def fetch_repository_metrics(self) -> RepositoryMetrics:
         """Fetch current repository metrics from GitHub API"""
-        repo_data = self._fetch_repo_data()
-        stats_data = self._fetch_repo_stats()
+        # One GraphQL request when authenticated; the REST endpoints are the
+        # fallback without a token or if the GraphQL request fails
+        fetched = self._fetch_via_graphql() if self.github_token else None
+        if fetched is not None:
+            repo_data, stats_data = fetched
+        elif aiohttp is not None:
+            # run_sync also works when an event loop is already running
+            # (Jupyter, Streamlit), where asyncio.run() would raise
+            from notebooks.model_providers import run_sync
+            repo_data, stats_data = run_sync(self._afetch_repo_data_and_stats())
+        else:
+            repo_data = self._fetch_repo_data()
+            stats_data = self._fetch_repo_stats()
         
         metrics = RepositoryMetrics(
             date=date.today().strftime("%Y-%m-%d"),
@@ -166,79 +350,257 @@ class GitHubMetricsTracker:
         )
         
         self._save_metrics(metrics, "repository")
+        self._save_etag_cache()
         return metrics
     
+    @property
+    def _etags(self) -> Dict:
+        """ETag cache, loaded from disk on first use"""
+        if self._etag_cache is None:
+            try:
+                cache = read_json(self._etag_cache_path)
+            except (OSError, ValueError):
+                cache = {}
+            # Drop entries keyed on a since= date by older versions
+            self._etag_cache = {k: v for k, v in cache.items() if "since=" not in k}
+            self._etag_cache_dirty = len(self._etag_cache) != len(cache)
+        return self._etag_cache
+    
+    def _save_etag_cache(self):
+        """Write the ETag cache back if any entry changed"""
+        if self._etag_cache_dirty:
+            write_json(self._etag_cache_path, self._etag_cache, indent=False)
+            self._etag_cache_dirty = False
+    
+    @staticmethod
+    def _etag_key(url: str, params: Optional[Dict]) -> str:
+        """
+        Cache key for a request. The commits "since" date changes daily, so
+        it is left out to keep one entry per endpoint; an ETag only matches
+        an identical body, so reusing it across dates is safe.
+        """
+        params = {k: v for k, v in (params or {}).items() if k != "since"}
+        if not params:
+            return url
+        return url + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    
+    def _conditional_result(self, key: str, status: int, etag: Optional[str], value_loader):
+        """
+        Resolve a conditional GET: a 304 returns the cached value, a 200
+        stores the new ETag and value. Returns (status, value), with 304
+        reported as 200 and value None for any other status.
+        """
+        if status == 304 and key in self._etags:
+            return 200, self._etags[key][1]
+        if status != 200:
+            return status, None
+        value = value_loader()
+        if etag:
+            self._etags[key] = [etag, value]
+            self._etag_cache_dirty = True
+        return 200, value
+    
+    def _rate_limiter(self, url: str) -> GitHubRateLimiter:
+        """Bucket for the rate-limit resource url counts against"""
+        if url.endswith("/graphql"):
+            return self.rate_limiters["graphql"]
+        if "/search/" in url:
+            return self.rate_limiters["search"]
+        return self.rate_limiters["core"]
+    
+    def _conditional_get(self, url: str, params: Optional[Dict] = None, parse=None) -> tuple:
+        """
+        GET through the session with If-None-Match from the ETag cache.
+        parse(body, headers), if given, reduces the response to the value
+        that is returned and cached (the JSON body otherwise).
+        """
+        key = self._etag_key(url, params)
+        cached = self._etags.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        limiter = self._rate_limiter(url)
+        limiter.acquire()
+        response = self.session.get(url, params=params, headers=headers, timeout=GITHUB_TIMEOUT)
+        limiter.update_from_headers(response.headers)
+        def load():
+            body = response.json()
+            return parse(body, response.headers) if parse else body
+        
+        return self._conditional_result(key, response.status_code, response.headers.get("ETag"), load)
+    
+    async def _aconditional_get(self, session, url: str, params: Optional[Dict] = None,
+                                parse=None) -> tuple:
+        """
+        Async variant of _conditional_get() over an aiohttp session, retrying
+        transient errors like the requests session's Retry adapter
+        """
+        key = self._etag_key(url, params)
+        cached = self._etags.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        limiter = self._rate_limiter(url)
+        for attempt in range(GITHUB_RETRIES + 1):
+            last_attempt = attempt == GITHUB_RETRIES
+            await limiter.aacquire()
+            try:
+                async with session.get(url, params=params, headers=headers) as response:
+                    limiter.update_from_headers(response.headers)
+                    if last_attempt or response.status not in GITHUB_RETRY_STATUSES:
+                        value = None
+                        if response.status == 200:
+                            value = await response.json()
+                            if parse:
+                                value = parse(value, response.headers)
+                        return self._conditional_result(key, response.status, response.headers.get("ETag"),
+                                                        lambda: value)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+            await asyncio.sleep(GITHUB_RETRY_BACKOFF * 2 ** attempt)
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """Authorization header for the GitHub API, if a token is set"""
+        if self.github_token:
+            return {"Authorization": f"token {self.github_token}"}
+        return {}
+    
+    def _stats_requests(self) -> Dict[str, tuple]:
+        """
+        (url, params, count) for each statistic in _fetch_repo_stats(), where
+        count(body, headers) turns the response into the statistic. Every
+        request asks for a 1-item page: issue and PR totals come from the
+        search API's total_count, the rest from the Link header's last page.
+        """
+        repo_url = f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}"
+        search_url = f"{self.api_base}/search/issues"
+        repo_query = f"repo:{self.repo_owner}/{self.repo_name}"
+        since = (date.today() - timedelta(days=7)).isoformat()
+        return {
+            "closed_issues": (search_url, {"q": f"{repo_query} is:issue is:closed", "per_page": 1}, _search_total),
+            "pull_requests": (search_url, {"q": f"{repo_query} is:pr", "per_page": 1}, _search_total),
+            "contributors": (f"{repo_url}/contributors", {"per_page": 1}, _last_page_count),
+            "commits_last_week": (f"{repo_url}/commits", {"since": since, "per_page": 1}, _last_page_count)
+        }
+    
+    def _fetch_via_graphql(self) -> Optional[tuple]:
+        """
+        Fetch repository data and statistics in one GraphQL request.
+        Returns (repo_data, stats) keyed like the REST results, or None on
+        any error.
+        """
+        since = (date.today() - timedelta(days=7)).isoformat() + "T00:00:00Z"
+        payload = {
+            "query": GITHUB_METRICS_QUERY,
+            "variables": {"owner": self.repo_owner, "name": self.repo_name, "since": since}
+        }
+        
+        try:
+            url = f"{self.api_base}/graphql"
+            limiter = self._rate_limiter(url)
+            limiter.acquire()
+            response = self.session.post(url, json=payload, timeout=GITHUB_TIMEOUT)
+            limiter.update_from_headers(response.headers)
+            response.raise_for_status()
+            body = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error fetching GraphQL metrics: {e}")
+            return None
+        
+        repo = (body.get("data") or {}).get("repository")
+        if body.get("errors") or not repo:
+            print(f"Error fetching GraphQL metrics: {body.get('errors')}")
+            return None
+        
+        branch = repo.get("defaultBranchRef") or {}
+        history = (branch.get("target") or {}).get("history") or {}
+        repo_data = {
+            "stargazers_count": repo["stargazerCount"],
+            "forks_count": repo["forkCount"],
+            "watchers_count": repo["stargazerCount"],
+            "open_issues_count": repo["openIssues"]["totalCount"] + repo["openPullRequests"]["totalCount"]
+        }
+        stats = {
+            "closed_issues": repo["closedIssues"]["totalCount"],
+            "pull_requests": repo["pullRequests"]["totalCount"],
+            "contributors": repo["mentionableUsers"]["totalCount"],
+            "commits_last_week": history.get("totalCount", 0)
+        }
+        return repo_data, stats
+    
     def _fetch_repo_data(self) -> Dict:
         """Fetch basic repository data"""
         url = f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}"
-        headers = {}
-        
-        if self.github_token:
-            headers["Authorization"] = f"token {self.github_token}"
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            status, body = self._conditional_get(url)
         except requests.RequestException as e:
             print(f"Error fetching repo data: {e}")
             return {}
+        if body is None:
+            print(f"Error fetching repo data: HTTP {status}")
+            return {}
+        return body
     
     def _fetch_repo_stats(self) -> Dict:
         """Fetch repository statistics"""
-        stats = {
-            "closed_issues": 0,
-            "pull_requests": 0,
-            "contributors": 0,
-            "commits_last_week": 0
-        }
+        stats = {name: 0 for name in self._stats_requests()}
         
         if not self.github_token:
             return stats
         
-        headers = {"Authorization": f"token {self.github_token}"}
+        for name, (url, params, count) in self._stats_requests().items():
+            try:
+                status, value = self._conditional_get(url, params, count)
+                if value is not None:
+                    stats[name] = value
+            except:
+                pass
         
-        # Fetch closed issues
-        try:
-            url = f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}/issues"
-            params = {"state": "closed", "per_page": 1}
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                # Get total from Link header or fetch all
-                stats["closed_issues"] = len(response.json())
-        except:
-            pass
+        return stats
+    
+    async def _afetch_repo_data_and_stats(self) -> tuple:
+        """
+        Fetch the repository data and all statistics concurrently over one
+        aiohttp session, so the five requests take about one round trip.
+        """
+        async with aiohttp.ClientSession(
+            headers=self._auth_headers(),
+            timeout=aiohttp.ClientTimeout(total=GITHUB_TIMEOUT)
+        ) as session:
+            return await asyncio.gather(
+                self._afetch_repo_data(session),
+                self._afetch_repo_stats(session)
+            )
+    
+    async def _afetch_repo_data(self, session) -> Dict:
+        """Async variant of _fetch_repo_data()"""
+        url = f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}"
         
-        # Fetch pull requests
         try:
-            url = f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}/pulls"
-            params = {"state": "all", "per_page": 100}
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                stats["pull_requests"] = len(response.json())
-        except:
-            pass
+            status, body = await self._aconditional_get(session, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching repo data: {e}")
+            return {}
+        if body is None:
+            print(f"Error fetching repo data: HTTP {status}")
+            return {}
+        return body
+    
+    async def _afetch_repo_stats(self, session) -> Dict:
+        """Async variant of _fetch_repo_stats()"""
+        requests_by_stat = self._stats_requests()
+        stats = {name: 0 for name in requests_by_stat}
         
-        # Fetch contributors count
-        try:
-            url = f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}/contributors"
-            response = requests.get(url, headers=headers, params={"per_page": 100}, timeout=10)
-            if response.status_code == 200:
-                stats["contributors"] = len(response.json())
-        except:
-            pass
+        if not self.github_token:
+            return stats
         
-        # Fetch commits from last week
-        try:
-            url = f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}/commits"
-            since = (date.today() - timedelta(days=7)).isoformat()
-            params = {"since": since, "per_page": 100}
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                stats["commits_last_week"] = len(response.json())
-        except:
-            pass
+        async def fetch(name: str, url: str, params: Dict, count):
+            try:
+                status, value = await self._aconditional_get(session, url, params, count)
+                if value is not None:
+                    stats[name] = value
+            except Exception:
+                pass
         
+        await asyncio.gather(*[fetch(name, *request) for name, request in requests_by_stat.items()])
         return stats
     
     def _save_metrics(self, metrics: RepositoryMetrics, metric_type: str):
@@ -246,54 +608,58 @@ class GitHubMetricsTracker:
         filename = f"{metrics.date}_{metric_type}.json"
         filepath = self.metrics_dir / filename
         
-        with open(filepath, "w") as f:
-            json.dump(asdict(metrics), f, indent=2)
+        write_json(filepath, metrics._to_dict(), indent=PRETTY_JSON)
 
 
 class CourseCompletionTracker:
     """Track course completion rates and student progress"""
     
     def __init__(self):
-        self.metrics_dir = Path(__file__).parent.parent / "content" / "metrics"
-        self.metrics_dir.mkdir(parents=True, exist_ok=True)
-        self.progress_file = Path(__file__).parent.parent / "content" / "student_progress.json"
+        self.metrics_dir = METRICS_DIR
+        ensure_dir(self.metrics_dir)
+        self.progress_file = PROGRESS_FILE
         
         # Initialize progress file if it doesn't exist
         if not self.progress_file.exists():
-            self.progress_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.progress_file, "w") as f:
-                json.dump({}, f)
+            ensure_dir(self.progress_file.parent)
+            write_json(self.progress_file, {}, indent=False)
+        
+        # ((mtime_ns, size), parsed data) of the last progress file read
+        self._progress_cache = None
     
     def calculate_completion_metrics(self) -> CourseMetrics:
         """Calculate course completion metrics from student progress data"""
         progress_data = self._load_progress_data()
-        
         total_students = len(progress_data)
-        active_students = sum(1 for p in progress_data.values() if p.get("last_activity_date"))
         
-        completions = sum(1 for p in progress_data.values() 
-                         if p.get("completion_rate", 0) >= 100)
+        # Single pass over the students for every aggregate
+        active_students = 0
+        completions = 0
+        total_progress = 0
+        level_totals = dict.fromkeys(COURSE_LEVELS, 0)
+        tool_usage = Counter()
+        for progress in progress_data.values():
+            if progress.get("last_activity_date"):
+                active_students += 1
+            rate = progress.get("completion_rate", 0)
+            if rate >= 100:
+                completions += 1
+            total_progress += rate
+            levels = progress.get("levels", {})
+            for level in COURSE_LEVELS:
+                level_totals[level] += levels.get(level, {}).get("completion_rate", 0)
+            tool_usage.update(progress.get("tools_used", []))
         
         completion_rate = (completions / total_students * 100) if total_students > 0 else 0
         
-        # Calculate progress by level
+        # Average progress by level (students without the level count as 0)
         progress_by_level = {
-            "foundations": self._calculate_level_progress(progress_data, "foundations"),
-            "engineering": self._calculate_level_progress(progress_data, "engineering"),
-            "professional": self._calculate_level_progress(progress_data, "professional")
+            level: level_total / total_students if total_students > 0 else 0.0
+            for level, level_total in level_totals.items()
         }
         
-        # Calculate average progress
-        total_progress = sum(p.get("completion_rate", 0) for p in progress_data.values())
         average_progress = total_progress / total_students if total_students > 0 else 0
         
-        # Track tool usage
-        tool_usage = {}
-        for progress in progress_data.values():
-            tools = progress.get("tools_used", [])
-            for tool in tools:
-                tool_usage[tool] = tool_usage.get(tool, 0) + 1
-        
         metrics = CourseMetrics(
             date=date.today().strftime("%Y-%m-%d"),
             total_students=total_students,
@@ -302,51 +668,51 @@ class CourseCompletionTracker:
             completion_rate=completion_rate,
             progress_by_level=progress_by_level,
             average_progress=average_progress,
-            students_by_tool_usage=tool_usage
+            students_by_tool_usage=dict(tool_usage)
         )
         
         self._save_metrics(metrics, "course")
         return metrics
     
+    def _progress_file_key(self) -> tuple:
+        stat = self.progress_file.stat()
+        return stat.st_mtime_ns, stat.st_size
+    
     def _load_progress_data(self) -> Dict:
-        """Load student progress data"""
+        """Load student progress data, reusing the last parse while the file is unchanged"""
         try:
-            with open(self.progress_file, "r") as f:
-                return json.load(f)
+            key = self._progress_file_key()
+            if self._progress_cache is not None and self._progress_cache[0] == key:
+                return self._progress_cache[1]
+            data = read_json(self.progress_file)
         except:
             return {}
-    
-    def _calculate_level_progress(self, progress_data: Dict, level: str) -> float:
-        """Calculate average progress for a specific level"""
-        level_completions = []
-        for progress in progress_data.values():
-            level_progress = progress.get("levels", {}).get(level, {}).get("completion_rate", 0)
-            level_completions.append(level_progress)
-        
-        if not level_completions:
-            return 0.0
-        
-        return sum(level_completions) / len(level_completions)
+        self._progress_cache = (key, data)
+        return data
     
     def update_student_progress(self, student_id: str, progress_data: Dict):
         """Update individual student progress"""
-        all_progress = self._load_progress_data()
+        # Copy so the cached data is only replaced once the write succeeds
+        all_progress = dict(self._load_progress_data())
         all_progress[student_id] = {
             **all_progress.get(student_id, {}),
             **progress_data,
             "last_updated": date.today().isoformat()
         }
         
-        with open(self.progress_file, "w") as f:
-            json.dump(all_progress, f, indent=2)
+        # Compact, and written to a temp file then renamed, so a crash
+        # mid-write can't leave a truncated progress file
+        tmp_file = self.progress_file.with_suffix(".tmp")
+        write_json(tmp_file, all_progress, indent=False)
+        os.replace(tmp_file, self.progress_file)
+        self._progress_cache = (self._progress_file_key(), all_progress)
     
     def _save_metrics(self, metrics: CourseMetrics, metric_type: str):
         """Save metrics to file"""
         filename = f"{metrics.date}_{metric_type}.json"
         filepath = self.metrics_dir / filename
         
-        with open(filepath, "w") as f:
-            json.dump(asdict(metrics), f, indent=2)
+        write_json(filepath, metrics._to_dict(), indent=PRETTY_JSON)
 
 
 class MetricsDashboard:
@@ -356,69 +722,128 @@ class MetricsDashboard:
         self.traffic_tracker = GoogleAnalyticsTracker()
         self.repo_tracker = GitHubMetricsTracker()
         self.course_tracker = CourseCompletionTracker()
-        self.metrics_dir = Path(__file__).parent.parent / "content" / "metrics"
-        self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        self.metrics_dir = METRICS_DIR
+        ensure_dir(self.metrics_dir)
     
-    def generate_daily_report(self) -> Dict:
-        """Generate daily metrics report"""
+    def generate_daily_report(self, refresh: bool = False) -> Dict:
+        """
+        Generate daily metrics report. Sections of today's saved report that
+        are younger than their REPORT_TTL_SECONDS entry are reused instead of
+        fetched again, unless refresh is True.
+        """
+        report_file = self.metrics_dir / f"daily_report_{date.today().strftime('%Y-%m-%d')}.json"
+        cached = {} if refresh else self._load_report(report_file)
+        fetched_at = cached.get("fetched_at", {})
+        
+        fetchers = {
+            "traffic": lambda: self.traffic_tracker.fetch_traffic_metrics()._to_dict(),
+            "repository": lambda: self.repo_tracker.fetch_repository_metrics()._to_dict(),
+            "course": lambda: self.course_tracker.calculate_completion_metrics()._to_dict()
+        }
+        
+        now = time.time()
+        stale = [name for name in fetchers
+                 if name not in cached or now - fetched_at.get(name, 0) >= REPORT_TTL_SECONDS[name]]
+        if not stale:
+            return cached
+        
         report = {
             "date": date.today().isoformat(),
-            "timestamp": datetime.now().isoformat(),
-            "traffic": asdict(self.traffic_tracker.fetch_traffic_metrics()),
-            "repository": asdict(self.repo_tracker.fetch_repository_metrics()),
-            "course": asdict(self.course_tracker.calculate_completion_metrics())
+            "timestamp": datetime.now().isoformat()
         }
+        # The trackers are independent (two are network-bound), so stale
+        # sections are fetched concurrently
+        with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+            futures = {name: executor.submit(fetchers[name]) for name in stale}
+        for name in fetchers:
+            report[name] = futures[name].result() if name in stale else cached[name]
+        report["fetched_at"] = {name: now if name in stale else fetched_at[name] for name in fetchers}
         
         # Save daily report
-        report_file = self.metrics_dir / f"daily_report_{date.today().strftime('%Y-%m-%d')}.json"
-        with open(report_file, "w") as f:
-            json.dump(report, f, indent=2)
+        write_json(report_file, report, indent=PRETTY_JSON)
         
         return report
     
-    def generate_weekly_summary(self) -> Dict:
-        """Generate weekly metrics summary"""
+    @staticmethod
+    def _load_report(report_file: Path, max_age: Optional[float] = None) -> Dict:
+        """Load a saved report, or {} if missing, unreadable or older than max_age seconds"""
+        try:
+            if max_age is not None and time.time() - report_file.stat().st_mtime >= max_age:
+                return {}
+            return read_json(report_file)
+        except (OSError, ValueError):
+            return {}
+    
+    def generate_weekly_summary(self, refresh: bool = False) -> Dict:
+        """
+        Generate weekly metrics summary. Today's saved summary is reused if
+        it is younger than WEEKLY_SUMMARY_TTL_SECONDS, unless refresh is True.
+        """
+        summary_file = self.metrics_dir / f"weekly_summary_{date.today().strftime('%Y-%m-%d')}.json"
+        if not refresh:
+            cached = self._load_report(summary_file, max_age=WEEKLY_SUMMARY_TTL_SECONDS)
+            if cached:
+                return cached
+        
         # Load last 7 days of reports
         week_start = date.today() - timedelta(days=7)
         
-        reports = []
-        for i in range(7):
-            report_date = (week_start + timedelta(days=i)).strftime("%Y-%m-%d")
-            report_file = self.metrics_dir / f"daily_report_{report_date}.json"
-            
-            if report_file.exists():
-                with open(report_file, "r") as f:
-                    reports.append(json.load(f))
+        # One directory scan finds which of the window's daily reports
+        # exist, so a short history returns before any report is read
+        window = {f"daily_report_{(week_start + timedelta(days=i)).isoformat()}.json" for i in range(7)}
+        with os.scandir(self.metrics_dir) as entries:
+            names = sorted(entry.name for entry in entries if entry.name in window)
         
-        if not reports:
+        if not names:
             return {"error": "No reports available"}
+        if len(names) < 2:
+            # A single day has nothing to diff against (e.g. the first week
+            # of deployment); skip the reads, aggregation and summary write
+            return {"error": "Insufficient history"}
+        
+        # Accumulate every traffic aggregate in one pass over the reports
+        # (read lazily, in date order); the repository and course deltas
+        # only need the first and last report
+        first = last = None
+        count = page_views = unique_visitors = 0
+        bounce_rate_total = 0.0
+        for report in (read_json(self.metrics_dir / name) for name in names):
+            traffic = report["traffic"]
+            page_views += traffic["page_views"]
+            unique_visitors = max(unique_visitors, traffic["unique_visitors"])
+            bounce_rate_total += traffic["bounce_rate"]
+            count += 1
+            if first is None:
+                first = report
+            last = report
+        
+        first_repo, last_repo = first["repository"], last["repository"]
+        first_course, last_course = first["course"], last["course"]
         
         # Calculate weekly summary
         summary = {
             "week_start": week_start.isoformat(),
             "week_end": date.today().isoformat(),
             "traffic": {
-                "total_page_views": sum(r["traffic"]["page_views"] for r in reports),
-                "total_unique_visitors": max(r["traffic"]["unique_visitors"] for r in reports),
-                "avg_bounce_rate": sum(r["traffic"]["bounce_rate"] for r in reports) / len(reports)
+                "total_page_views": page_views,
+                "total_unique_visitors": unique_visitors,
+                "avg_bounce_rate": bounce_rate_total / count
             },
             "repository": {
-                "stars_gained": reports[-1]["repository"]["stars"] - reports[0]["repository"]["stars"],
-                "forks_gained": reports[-1]["repository"]["forks"] - reports[0]["repository"]["forks"],
-                "current_stars": reports[-1]["repository"]["stars"],
-                "current_forks": reports[-1]["repository"]["forks"]
+                "stars_gained": last_repo["stars"] - first_repo["stars"],
+                "forks_gained": last_repo["forks"] - first_repo["forks"],
+                "current_stars": last_repo["stars"],
+                "current_forks": last_repo["forks"]
             },
             "course": {
-                "new_completions": reports[-1]["course"]["completions"] - reports[0]["course"]["completions"],
-                "completion_rate_change": reports[-1]["course"]["completion_rate"] - reports[0]["course"]["completion_rate"],
-                "current_total_students": reports[-1]["course"]["total_students"]
+                "new_completions": last_course["completions"] - first_course["completions"],
+                "completion_rate_change": last_course["completion_rate"] - first_course["completion_rate"],
+                "current_total_students": last_course["total_students"]
             }
         }
         
         # Save weekly summary
-        summary_file = self.metrics_dir / f"weekly_summary_{date.today().strftime('%Y-%m-%d')}.json"
-        with open(summary_file, "w") as f:
-            json.dump(summary, f, indent=2)
+        write_json(summary_file, summary, indent=PRETTY_JSON)
         
         return summary
 
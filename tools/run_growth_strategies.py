@@ -3,7 +3,9 @@ Run Growth Strategies Automation
 Scheduled task runner for content marketing engine
 """
 
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
@@ -17,8 +19,95 @@ from content_marketing_engine import (
     WebinarScheduler
 )
 
+CONTENT_DIR = Path(__file__).parent.parent / "content"
+
+# Rotation position for blog and webinar topics, so each run doesn't have to
+# count the files already generated
+STATE_PATH = CONTENT_DIR / "growth_strategies_state.json"
+
+
+def _load_state():
+    """Load the rotation state, seeding it from existing content on first run"""
+    try:
+        with open(STATE_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {
+            "blog_index": sum(1 for _ in CONTENT_DIR.glob("blog/*.json")),
+            "webinar_index": sum(1 for _ in CONTENT_DIR.glob("webinars/*.json"))
+        }
+
+
+def _save_state(state):
+    """Write the rotation state atomically (temp file + rename)"""
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, STATE_PATH)
+
+
+# Append-only run log (one JSON record per line). Once it grows past
+# AUTOMATION_LOG_MAX_BYTES it is compacted to the last AUTOMATION_LOG_KEEP runs.
+AUTOMATION_LOG_PATH = CONTENT_DIR / "automation_log.jsonl"
+AUTOMATION_LOG_KEEP = 50
+AUTOMATION_LOG_MAX_BYTES = 256 * 1024
+# Whole-file JSON array log written by earlier versions
+LEGACY_AUTOMATION_LOG_PATH = CONTENT_DIR / "automation_log.json"
+
+
+def tail_log(path, n, block_size=4096):
+    """Return the last n records of a JSON Lines file, reading backwards from the end"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= n:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = [line for line in data.splitlines() if line.strip()]
+    return [json.loads(line) for line in lines[-n:]]
+
+
+def append_log(record, path=AUTOMATION_LOG_PATH):
+    """Append one record to the run log, compacting it when it gets large"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    
+    if path.stat().st_size > AUTOMATION_LOG_MAX_BYTES:
+        kept = tail_log(path, AUTOMATION_LOG_KEEP)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text("".join(json.dumps(r) + "\n" for r in kept))
+        os.replace(tmp_path, path)
+
+
+def migrate_legacy_log(legacy_path=LEGACY_AUTOMATION_LOG_PATH, path=AUTOMATION_LOG_PATH):
+    """
+    Move the runs from an old automation_log.json array into the JSON Lines
+    log, ahead of any runs already there, then remove the old file
+    """
+    if not legacy_path.exists():
+        return
+    with open(legacy_path, "r") as f:
+        records = json.load(f)
+    if path.exists():
+        records += [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    os.replace(tmp_path, path)
+    legacy_path.unlink()
+
+
+@lru_cache(maxsize=1)
 def load_config():
-    """Load growth strategies configuration"""
+    """
+    Load growth strategies configuration. Parsed once per process; the
+    returned dict is shared, so treat it as read-only.
+    """
     config_path = Path(__file__).parent / "growth_strategies_config.json"
     with open(config_path, "r") as f:
         return json.load(f)
@@ -26,6 +115,7 @@ def load_config():
 def run_weekly_tasks():
     """Run weekly content marketing tasks"""
     config = load_config()
+    state = _load_state()
     
     # Initialize components
     blog_gen = BlogPostGenerator()
@@ -47,7 +137,7 @@ def run_weekly_tasks():
         topics = config["content_marketing"]["blog_schedule"]["topics"]
         
         # Get next topic (simple rotation)
-        topic_index = len([f for f in Path(__file__).parent.parent.glob("content/blog/*.json")]) % len(topics)
+        topic_index = state["blog_index"] % len(topics)
         topic = topics[topic_index]
         
         blog_post = blog_gen.generate_blog_post(
@@ -56,6 +146,7 @@ def run_weekly_tasks():
             publish_date=next_week
         )
         results["blog_posts_scheduled"].append(blog_post.title)
+        state["blog_index"] += 1
     
     # Check for new case studies to process
     # (This would typically be triggered by user submissions)
@@ -69,7 +160,7 @@ def run_weekly_tasks():
         topics = config["content_marketing"]["webinar_schedule"]["topics"]
         
         # Get next webinar topic
-        webinar_index = len([f for f in Path(__file__).parent.parent.glob("content/webinars/*.json")]) % len(topics)
+        webinar_index = state["webinar_index"] % len(topics)
         topic = topics[webinar_index]
         
         webinar = webinar_scheduler.schedule_webinar(
@@ -78,7 +169,9 @@ def run_weekly_tasks():
             duration=config["content_marketing"]["webinar_schedule"]["duration_minutes"]
         )
         results["webinars_scheduled"].append(webinar["topic"])
+        state["webinar_index"] += 1
     
+    _save_state(state)
     return results
 
 if __name__ == "__main__":
@@ -89,18 +182,8 @@ if __name__ == "__main__":
     print(json.dumps(results, indent=2))
     
     # Save results log
-    log_path = Path(__file__).parent.parent / "content" / "automation_log.json"
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    if log_path.exists():
-        with open(log_path, "r") as f:
-            logs = json.load(f)
-    else:
-        logs = []
-    
-    logs.append(results)
-    
-    with open(log_path, "w") as f:
-        json.dump(logs[-50:], f, indent=2)  # Keep last 50 runs
+    log_path = AUTOMATION_LOG_PATH
+    migrate_legacy_log()
+    append_log(results, log_path)
     
     print(f"\nLog saved to {log_path}")
\ No newline at end of file
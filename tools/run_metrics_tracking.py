@@ -11,10 +11,14 @@ sys.path.append(str(Path(__file__).parent))
 
 from metrics_tracker import MetricsDashboard
 
+# Day of the week (Monday == 0) on which the weekly summary is generated
+WEEKLY_SUMMARY_WEEKDAY = 6  # Sunday
+
 
 def run_daily_metrics():
     """Run daily metrics tracking"""
-    print(f"Running daily metrics tracking - {datetime.now().isoformat()}")
+    now = datetime.now()
+    print(f"Running daily metrics tracking - {now.isoformat()}")
     print("=" * 60)
     
     dashboard = MetricsDashboard()
@@ -29,11 +33,14 @@ def run_daily_metrics():
     print(f"- Course: {report['course']['completion_rate']:.1f}% completion rate")
     
     # Generate weekly summary if it's the end of the week
-    if datetime.now().weekday() == 6:  # Sunday
+    if now.weekday() == WEEKLY_SUMMARY_WEEKDAY:
         print("\nGenerating weekly summary...")
         summary = dashboard.generate_weekly_summary()
-        print(f"- Stars gained this week: {summary['repository']['stars_gained']}")
-        print(f"- New completions: {summary['course']['new_completions']}")
+        if "error" in summary:
+            print(f"- Skipped: {summary['error']}")
+        else:
+            print(f"- Stars gained this week: {summary['repository']['stars_gained']}")
+            print(f"- New completions: {summary['course']['new_completions']}")
     
     print("\n" + "=" * 60)
     print("Metrics tracking complete!")